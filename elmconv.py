@@ -18,7 +18,10 @@ import re
 import struct
 import subprocess
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 from typing import Protocol
 
 # =============================================================================
@@ -71,6 +74,9 @@ def default_logger(message: str, level: str = "info") -> None:
 
 NOTE_NAMES = ["c", "c#", "d", "d#", "e", "f", "f#", "g", "g#", "a", "a#", "b"]
 
+# Precomputed Tonverk note names for MIDI 0-127 (C0 = 24, so 60 -> 'c3')
+_MIDI_TO_NAME = [f"{NOTE_NAMES[i % 12]}{(i // 12) - 2}" for i in range(128)]
+
 # Anchor note mapping for thinning (uppercase only, case-sensitive)
 ANCHOR_NOTE_MAP = {
     "C": 0,
@@ -93,10 +99,26 @@ ANCHOR_NOTE_MAP = {
     "H": 11,
 }
 
+# Single-lookup table for parse_anchor_note (canonical numbers + note names)
+_ANCHOR_LOOKUP = {str(i): i for i in range(12)} | ANCHOR_NOTE_MAP
+
+# bytes.translate() table mapping a 24-bit sample's top byte to its sign-extension byte
+_SIGN_EXTEND_24 = bytes(0xFF if b & 0x80 else 0x00 for b in range(256))
+
+# Precompiled binary layouts (avoids re-parsing format strings per call)
+_U32_STRUCT = struct.Struct("<I")
+_I32_STRUCT = struct.Struct("<i")
+_U32_BE_STRUCT = struct.Struct(">I")
+_SMPL_HEADER_STRUCT = struct.Struct("<IIIIIIIII")  # WAV smpl chunk header
+_SMPL_LOOP_STRUCT = struct.Struct("<IIIIII")  # WAV smpl chunk loop record
+
 # Name length limits (based on Tonverk Factory Library analysis: max observed = 21 chars)
 MAX_NAME_WARN = 24  # Warning threshold: may be truncated on Tonverk display
 MAX_NAME_ERROR = 64  # Error threshold: filesystem safety limit
 
+# Sanity limit for EXS instrument files (large multi-zone instruments exceed 1MB)
+MAX_EXS_FILE_SIZE = 64 * 1024 * 1024
+
 # Characters invalid in filenames (cross-platform)
 INVALID_FILENAME_CHARS = r'/\:*?"<>|'
 
@@ -119,6 +141,17 @@ FFMPEG_SEARCH_PATHS = {
 # Cached ffmpeg path (None = not searched, "" = not found, str = found path)
 _ffmpeg_path: str | None = None
 
+# Cached tool commands resolved to absolute paths (e.g., {"ffprobe": "/usr/bin/ffprobe"})
+_tool_cmds: dict[str, str] = {}
+
+# Cached check_ffmpeg() result (None = not checked yet)
+_ffmpeg_check: tuple[bool, bool] | None = None
+
+# Cached ffprobe results keyed by file version
+# ((path, size, mtime_ns) -> (sample_rate, sample_count)); cleared at the start
+# of each convert_to_elmulti() run
+_audio_info_cache: dict[tuple, tuple[int | None, int | None]] = {}
+
 
 # =============================================================================
 # Loop Point Convention (SFZ/elmulti)
@@ -220,6 +253,8 @@ class ConversionStats:
                 print(
                     f"Optimize loops: Yes (search range: {settings.get('loop_search_range', 5)})"
                 )
+                if settings.get("loop_len_align"):
+                    print(f"Loop length align: {settings['loop_len_align']} samples")
             else:
                 print("Optimize loops: No")
             sc_threshold = settings.get("single_cycle_threshold", 512)
@@ -335,32 +370,47 @@ def find_ffmpeg() -> str:
     return _ffmpeg_path
 
 
+def _get_tool_cmd(name: str) -> str:
+    """Resolve an ffmpeg suite tool to an absolute path (cached).
+
+    Resolving once avoids a PATH lookup on every subprocess call.
+
+    Args:
+        name: Tool name ("ffmpeg" or "ffprobe")
+
+    Returns:
+        str: Full path to the tool, or just the name if it cannot be resolved.
+    """
+    cmd = _tool_cmds.get(name)
+    if cmd is None:
+        import shutil
+
+        path = find_ffmpeg()
+        exe = f"{name}.exe" if sys.platform == "win32" else name
+        if path:
+            cmd = os.path.join(path, exe)
+        else:
+            cmd = shutil.which(name) or name
+        _tool_cmds[name] = cmd
+    return cmd
+
+
 def get_ffmpeg_cmd() -> str:
     """Get the ffmpeg command path.
 
     Returns:
-        str: Full path to ffmpeg, or just "ffmpeg" if in PATH.
+        str: Full path to ffmpeg, or just "ffmpeg" if it cannot be resolved.
     """
-    path = find_ffmpeg()
-    if path:
-        if sys.platform == "win32":
-            return os.path.join(path, "ffmpeg.exe")
-        return os.path.join(path, "ffmpeg")
-    return "ffmpeg"
+    return _get_tool_cmd("ffmpeg")
 
 
 def get_ffprobe_cmd() -> str:
     """Get the ffprobe command path.
 
     Returns:
-        str: Full path to ffprobe, or just "ffprobe" if in PATH.
+        str: Full path to ffprobe, or just "ffprobe" if it cannot be resolved.
     """
-    path = find_ffmpeg()
-    if path:
-        if sys.platform == "win32":
-            return os.path.join(path, "ffprobe.exe")
-        return os.path.join(path, "ffprobe")
-    return "ffprobe"
+    return _get_tool_cmd("ffprobe")
 
 
 def get_subprocess_kwargs() -> dict:
@@ -368,13 +418,15 @@ def get_subprocess_kwargs() -> dict:
 
     On Windows, this returns flags to hide the console window that would
     otherwise appear for each subprocess call (ffmpeg/ffprobe).
+    On POSIX, fd closing is skipped: Python opens files non-inheritable
+    (PEP 446), so there is nothing to close and the child spawns faster.
 
     Returns:
         dict: Keyword arguments to pass to subprocess.run()
     """
     if sys.platform == "win32":
         return {"creationflags": subprocess.CREATE_NO_WINDOW}
-    return {}
+    return {"close_fds": False}
 
 
 # =============================================================================
@@ -424,9 +476,20 @@ def get_ffmpeg_error_message(ffmpeg_available: bool, soxr_available: bool) -> st
 def check_ffmpeg():
     """Check if ffmpeg is available and has soxr resampler support.
 
+    The result is cached, so repeated calls during a batch run are free.
+
     Returns:
         tuple: (ffmpeg_available, soxr_available)
     """
+    global _ffmpeg_check
+
+    if _ffmpeg_check is None:
+        _ffmpeg_check = _probe_ffmpeg()
+    return _ffmpeg_check
+
+
+def _probe_ffmpeg():
+    """Run ffmpeg -version and inspect build configuration for soxr."""
     try:
         ffmpeg_cmd = get_ffmpeg_cmd()
         result = subprocess.run(
@@ -447,8 +510,27 @@ def check_ffmpeg():
         return (False, False)
 
 
-def get_sample_rate(filepath):
-    """Get sample rate of audio file using ffprobe."""
+def _probe_audio_info(filepath):
+    """Get (sample_rate, sample_count) of audio file with one ffprobe call.
+
+    Results are cached per file version (path, size and mtime), so a file
+    probed for its rate and later for its length is only probed once, and
+    a rewritten file is probed again.
+
+    Returns:
+        tuple: (sample_rate, sample_count), each None if unavailable
+    """
+    try:
+        st = os.stat(filepath)
+        key = (filepath, st.st_size, st.st_mtime_ns)
+    except OSError:
+        key = None
+    else:
+        cached = _audio_info_cache.get(key)
+        if cached is not None:
+            return cached
+
+    sample_rate = sample_count = None
     try:
         ffprobe_cmd = get_ffprobe_cmd()
         result = subprocess.run(
@@ -459,9 +541,9 @@ def get_sample_rate(filepath):
                 "-select_streams",
                 "a:0",
                 "-show_entries",
-                "stream=sample_rate",
+                "stream=sample_rate,nb_samples",
                 "-of",
-                "default=noprint_wrappers=1:nokey=1",
+                "default=noprint_wrappers=1",
                 filepath,
             ],
             capture_output=True,
@@ -469,10 +551,28 @@ def get_sample_rate(filepath):
             **get_subprocess_kwargs(),
         )
         if result.returncode == 0:
-            return int(result.stdout.strip())
-    except (FileNotFoundError, ValueError):
+            # Output lines: sample_rate=44100 / nb_samples=123456 (or N/A)
+            for line in result.stdout.splitlines():
+                name, _, value = line.partition("=")
+                try:
+                    if name == "sample_rate":
+                        sample_rate = int(value.strip())
+                    elif name == "nb_samples":
+                        sample_count = int(value.strip())
+                except ValueError:
+                    pass
+    except FileNotFoundError:
         pass
-    return None
+
+    info = (sample_rate, sample_count)
+    if key is not None:
+        _audio_info_cache[key] = info
+    return info
+
+
+def get_sample_rate(filepath):
+    """Get sample rate of audio file using ffprobe."""
+    return _probe_audio_info(filepath)[0]
 
 
 def get_sample_count(filepath):
@@ -481,29 +581,9 @@ def get_sample_count(filepath):
     Tries ffprobe first, falls back to wave module for WAV files.
     """
     # Try ffprobe first
-    try:
-        ffprobe_cmd = get_ffprobe_cmd()
-        result = subprocess.run(
-            [
-                ffprobe_cmd,
-                "-v",
-                "error",
-                "-select_streams",
-                "a:0",
-                "-show_entries",
-                "stream=nb_samples",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                filepath,
-            ],
-            capture_output=True,
-            text=True,
-            **get_subprocess_kwargs(),
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return int(result.stdout.strip())
-    except (FileNotFoundError, ValueError):
-        pass
+    sample_count = _probe_audio_info(filepath)[1]
+    if sample_count is not None:
+        return sample_count
 
     # Fallback to wave module for WAV files
     if filepath.lower().endswith(".wav"):
@@ -525,7 +605,8 @@ def read_wav_samples(filepath):
         filepath: Path to WAV file
 
     Returns:
-        list: Sample values as integers
+        Sequence of sample values as integers (a zero-copy memoryview
+        where the host byte order allows it, otherwise a list)
     """
     import wave
 
@@ -535,16 +616,28 @@ def read_wav_samples(filepath):
         data = w.readframes(nframes)
 
         if sampwidth == 3:  # 24-bit
-            samples = []
-            for i in range(0, len(data), 3):
-                b = data[i : i + 3]
-                val = int.from_bytes(b, "little", signed=True)
-                samples.append(val)
-            return samples
+            # Widen each 3-byte sample to a little-endian int32 slot using
+            # C-level strided slice copies; the top byte is the sign extension.
+            count = len(data) // 3
+            padded = bytearray(count * 4)
+            padded[0::4] = data[0 : count * 3 : 3]
+            padded[1::4] = data[1 : count * 3 : 3]
+            high = data[2 : count * 3 : 3]
+            padded[2::4] = high
+            padded[3::4] = high.translate(_SIGN_EXTEND_24)
+            if sys.byteorder == "little":
+                # Zero-copy view; indexes like a list of ints
+                return memoryview(padded).cast("i")
+            return list(struct.unpack(f"<{count}i", padded))
         elif sampwidth == 2:  # 16-bit
+            if sys.byteorder == "little" and len(data) == nframes * 2:
+                # Zero-copy view; indexes like a list of ints
+                return memoryview(data).cast("h")
             fmt = f"<{nframes}h"
             return list(struct.unpack(fmt, data))
         elif sampwidth == 1:  # 8-bit
+            if len(data) == nframes:
+                return memoryview(data).cast("b")
             fmt = f"<{nframes}b"
             return list(struct.unpack(fmt, data))
     return []
@@ -564,9 +657,9 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
 
     Note: If loop_start and loop_end are None, only the root note is embedded.
     """
-    import shutil
     import tempfile
 
+    tmp_path = None
     try:
         # Read original WAV file
         with open(wav_path, "rb") as f:
@@ -586,7 +679,7 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
                 chunk_id = f.read(4)
                 if len(chunk_id) < 4:
                     break
-                chunk_size = struct.unpack("<I", f.read(4))[0]
+                chunk_size = _U32_STRUCT.unpack(f.read(4))[0]
                 chunk_data = f.read(chunk_size)
                 if chunk_size % 2 == 1:  # padding
                     f.read(1)
@@ -597,7 +690,7 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
 
                 # Get sample rate from fmt chunk
                 if chunk_id == b"fmt ":
-                    sample_rate = struct.unpack("<I", chunk_data[4:8])[0]
+                    sample_rate = _U32_STRUCT.unpack_from(chunk_data, 4)[0]
 
                 chunks.append((chunk_id, chunk_data))
 
@@ -607,8 +700,7 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
 
         has_loop = loop_start is not None and loop_end is not None
 
-        smpl_data = struct.pack(
-            "<IIIIIIIII",
+        smpl_data = _SMPL_HEADER_STRUCT.pack(
             0,  # manufacturer
             0,  # product
             sample_period,
@@ -622,8 +714,7 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
 
         # Add loop information if provided
         if has_loop:
-            smpl_data += struct.pack(
-                "<IIIIII",
+            smpl_data += _SMPL_LOOP_STRUCT.pack(
                 0,  # cue_point_id
                 0,  # loop_type (0 = forward loop)
                 loop_start,
@@ -633,25 +724,31 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
             )
 
         # Write to temporary file first, then replace
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".wav", delete=False) as tmp:
+        # (same directory as target so os.replace() is an atomic rename)
+        with tempfile.NamedTemporaryFile(
+            mode="wb",
+            suffix=".wav",
+            dir=os.path.dirname(os.path.abspath(wav_path)),
+            delete=False,
+        ) as tmp:
             tmp_path = tmp.name
 
             # RIFF header (size placeholder)
             tmp.write(b"RIFF")
-            tmp.write(struct.pack("<I", 0))
+            tmp.write(_U32_STRUCT.pack(0))
             tmp.write(b"WAVE")
 
             # Write original chunks
             for chunk_id, chunk_data in chunks:
                 tmp.write(chunk_id)
-                tmp.write(struct.pack("<I", len(chunk_data)))
+                tmp.write(_U32_STRUCT.pack(len(chunk_data)))
                 tmp.write(chunk_data)
                 if len(chunk_data) % 2 == 1:
                     tmp.write(b"\x00")
 
             # Write smpl chunk
             tmp.write(b"smpl")
-            tmp.write(struct.pack("<I", len(smpl_data)))
+            tmp.write(_U32_STRUCT.pack(len(smpl_data)))
             tmp.write(smpl_data)
             if len(smpl_data) % 2 == 1:
                 tmp.write(b"\x00")
@@ -659,14 +756,16 @@ def embed_smpl_chunk(wav_path, loop_start=None, loop_end=None, midi_unity_note=6
             # Update file size
             file_size = tmp.tell() - 8
             tmp.seek(4)
-            tmp.write(struct.pack("<I", file_size))
+            tmp.write(_U32_STRUCT.pack(file_size))
 
         # Replace original file
-        shutil.move(tmp_path, wav_path)
+        os.replace(tmp_path, wav_path)
         return True
 
     except Exception as e:
         print(f"    Warning: Failed to embed smpl chunk: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return False
 
 
@@ -802,7 +901,9 @@ def calculate_single_cycle_loop(
     return loop_start, loop_end, warning
 
 
-def optimize_loop_points(samples, approx_start, approx_end, search_range=5):
+def optimize_loop_points(
+    samples, approx_start, approx_end, search_range=5, length_align=0
+):
     """Find optimal loop points to minimize amplitude discontinuity (clicks).
 
     This function optimizes for click minimization by finding loop points where
@@ -818,42 +919,110 @@ def optimize_loop_points(samples, approx_start, approx_end, search_range=5):
         approx_start: Approximate loop start position
         approx_end: Approximate loop end position (inclusive)
         search_range: Number of samples to search in each direction
+        length_align: If > 0, only consider loop lengths that are a multiple
+            of this many samples (see _aligned_loop_ends)
 
     Returns:
         tuple: (optimal_start, optimal_end, difference)
     """
+    if length_align > 0:
+        return _optimize_aligned_loop_points(
+            samples, approx_start, approx_end, search_range, length_align
+        )
+
     best_diff = float("inf")
     best_start = approx_start
     best_end = approx_end
 
     total_samples = len(samples)
 
-    for s_offset in range(-search_range, search_range + 1):
-        for e_offset in range(-search_range, search_range + 1):
-            test_start = approx_start + s_offset
-            test_end = approx_end + e_offset
+    # Clip both search windows to valid indices up front, and fetch the
+    # candidate end values once instead of once per start candidate
+    first_start = max(approx_start - search_range, 0)
+    last_start = min(approx_start + search_range, total_samples - 1)
+    first_end = max(approx_end - search_range, 0)
+    last_end = min(approx_end + search_range, total_samples - 1)
+    end_candidates = list(
+        enumerate(samples[first_end : last_end + 1], first_end)
+        if first_end <= last_end
+        else ()
+    )
 
-            # Validate index bounds
-            if test_start < 0 or test_start >= total_samples:
-                continue
-            if test_end < 0 or test_end >= total_samples:
-                continue
+    for test_start in range(first_start, last_start + 1):
+        start_value = samples[test_start]
+        for test_end, end_value in end_candidates:
             if test_end <= test_start:
                 continue
 
             # Minimize amplitude discontinuity at loop boundary
             # Playback: ... → samples[test_end] → samples[test_start] → ...
-            diff = abs(samples[test_end] - samples[test_start])
+            diff = abs(end_value - start_value)
             if diff < best_diff:
                 best_diff = diff
                 best_start = test_start
                 best_end = test_end
+                if diff == 0:
+                    # Cannot be improved on; later candidates only tie
+                    return best_start, best_end, best_diff
+
+    return best_start, best_end, best_diff
+
+
+def _aligned_loop_ends(loop_start, approx_end, search_range, align, total_samples):
+    """List loop end candidates whose loop length is a multiple of align.
+
+    Ends of the form loop_start + k*align - 1 inside the search window around
+    approx_end are preferred. If the window holds none, the nearest aligned
+    end below and above approx_end are used instead.
+
+    Returns:
+        list: Candidate loop end positions (inclusive), all < total_samples
+    """
+    first_end = approx_end - search_range
+    last_end = approx_end + search_range
+    # Smallest and largest k with loop_start + k*align - 1 inside the window
+    k_first = max(1, -(-(first_end - loop_start + 1) // align))
+    k_last = (last_end - loop_start + 1) // align
+    if k_first > k_last:
+        # No aligned end in the window: fall back to the nearest ones
+        k_below = max(1, (approx_end - loop_start + 1) // align)
+        k_first, k_last = k_below, k_below + 1
+    ends = (loop_start + k * align - 1 for k in range(k_first, k_last + 1))
+    return [end for end in ends if end < total_samples]
+
+
+def _optimize_aligned_loop_points(
+    samples, approx_start, approx_end, search_range, align
+):
+    """optimize_loop_points restricted to loop lengths that are multiples of align."""
+    best_diff = float("inf")
+    best_start = approx_start
+    best_end = approx_end
+
+    total_samples = len(samples)
+    first_start = max(approx_start - search_range, 0)
+    last_start = min(approx_start + search_range, total_samples - 1)
+
+    for test_start in range(first_start, last_start + 1):
+        start_value = samples[test_start]
+        for test_end in _aligned_loop_ends(
+            test_start, approx_end, search_range, align, total_samples
+        ):
+            diff = abs(samples[test_end] - start_value)
+            if diff < best_diff:
+                best_diff = diff
+                best_start = test_start
+                best_end = test_end
+                if diff == 0:
+                    return best_start, best_end, best_diff
 
     return best_start, best_end, best_diff
 
 
 def midi_to_note_name(midi_note):
     """Convert MIDI note number to Tonverk note name (e.g., 60 -> 'c3')."""
+    if 0 <= midi_note <= 127:
+        return _MIDI_TO_NAME[midi_note]
     octave = (midi_note // 12) - 2  # Tonverk uses C0 = 24
     note = NOTE_NAMES[midi_note % 12]
     return f"{note}{octave}"
@@ -922,7 +1091,12 @@ def parse_anchor_note(note_str):
     """
     note_str = str(note_str).strip()
 
-    # Try as integer first
+    # Fast path: plain 0-11 or a known note name
+    val = _ANCHOR_LOOKUP.get(note_str.upper())
+    if val is not None:
+        return val
+
+    # Other integer spellings (e.g., "05", "+3")
     try:
         val = int(note_str)
         if 0 <= val <= 11:
@@ -931,14 +1105,13 @@ def parse_anchor_note(note_str):
     except ValueError:
         pass
 
-    # Try as note name (uppercase only)
-    upper = note_str.upper()
-    if upper in ANCHOR_NOTE_MAP:
-        return ANCHOR_NOTE_MAP[upper]
-
     return None
 
 
+# Peak line of ffmpeg volumedetect output
+_MAX_VOLUME_PATTERN = re.compile(r"max_volume:\s*([-\d.]+)\s*dB")
+
+
 def get_peak_level(filepath):
     """Get peak level of audio file using ffmpeg volumedetect.
 
@@ -958,7 +1131,7 @@ def get_peak_level(filepath):
             **get_subprocess_kwargs(),
         )
         # Parse: max_volume: -3.5 dB
-        match = re.search(r"max_volume:\s*([-\d.]+)\s*dB", result.stderr)
+        match = _MAX_VOLUME_PATTERN.search(result.stderr)
         if match:
             return float(match.group(1))
     except Exception:
@@ -1018,42 +1191,155 @@ def normalize_audio(filepath, target_db=0.0):
         return False, 0.0
 
 
-def find_sample_file(sample_name, search_dirs):
-    """Find sample file in search directories."""
+# Note name embedded in sample filenames (e.g., "Piano-C#3-loud.wav")
+_SAMPLE_NOTE_PATTERN = re.compile(r"-([A-Ga-g][#b]?\d+)-", re.IGNORECASE)
+
+
+def _index_sample_dir(search_dir):
+    """List a sample directory once and build lookup tables.
+
+    Args:
+        search_dir: Directory to index
+
+    Returns:
+        tuple: (is_dir, lower_map, note_map) where lower_map maps lowercased
+            filenames and note_map maps uppercased note names to the first
+            matching filename (in listdir order). Maps are None if the
+            directory cannot be listed.
+    """
+    if not os.path.isdir(search_dir):
+        return False, None, None
+
+    # Try to list directory (may fail due to permissions)
+    try:
+        dir_contents = os.listdir(search_dir)
+    except (PermissionError, OSError):
+        return True, None, None
+
+    lower_map = {}
+    note_map = {}
+    for filename in dir_contents:
+        lower_map.setdefault(filename.lower(), filename)
+        file_match = _SAMPLE_NOTE_PATTERN.search(filename)
+        if file_match:
+            note_map.setdefault(file_match.group(1).upper(), filename)
+    return True, lower_map, note_map
+
+
+def _path_kind(path, entry_cache):
+    """Classify a path as "file", "dir" or None using cached listings.
+
+    Each parent directory is read once with os.scandir() and reused for
+    every later lookup in it. Names missing from the listing are checked
+    with stat() so case-insensitive filesystems behave as before.
+
+    Args:
+        path: Path to classify
+        entry_cache: Dict reused across calls ({directory: {name: kind}})
+
+    Returns:
+        str: "file" or "dir", or None if the path is neither
+    """
+    parent, name = os.path.split(path)
+    entries = entry_cache.get(parent)
+    if entries is None:
+        entries = entry_cache[parent] = {}
+        try:
+            with os.scandir(parent or ".") as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            entries[entry.name] = "file"
+                        elif entry.is_dir():
+                            entries[entry.name] = "dir"
+                        else:
+                            entries[entry.name] = ""
+                    except OSError:
+                        entries[entry.name] = ""
+        except OSError:
+            pass
+
+    kind = entries.get(name)
+    if kind is None:
+        if os.path.isfile(path):
+            kind = "file"
+        elif os.path.isdir(path):
+            kind = "dir"
+    return kind or None
+
+
+def find_sample_file(sample_name, search_dirs, dir_cache=None):
+    """Find sample file in search directories.
+
+    Args:
+        sample_name: Sample file name to look for
+        search_dirs: Directories to search, in priority order
+        dir_cache: Optional dict reused across calls to cache directory
+            listings (one listdir per directory instead of one per sample)
+
+    Returns:
+        str: Path to the sample file, or None if not found
+    """
+    if dir_cache is None:
+        dir_cache = {}
+
     for search_dir in search_dirs:
-        if not os.path.isdir(search_dir):
+        index = dir_cache.get(search_dir)
+        if index is None:
+            index = dir_cache[search_dir] = _index_sample_dir(search_dir)
+        is_dir, lower_map, note_map = index
+        if not is_dir:
             continue
 
-        # Exact match (no listdir needed)
+        # Exact match
         exact_path = os.path.join(search_dir, sample_name)
         if os.path.isfile(exact_path):
             return exact_path
 
-        # Try to list directory (may fail due to permissions)
-        try:
-            dir_contents = os.listdir(search_dir)
-        except (PermissionError, OSError):
+        if lower_map is None:
             continue
 
         # Case-insensitive match
-        sample_lower = sample_name.lower()
-        for filename in dir_contents:
-            if filename.lower() == sample_lower:
-                return os.path.join(search_dir, filename)
+        filename = lower_map.get(sample_name.lower())
+        if filename is not None:
+            return os.path.join(search_dir, filename)
 
         # Match by note name pattern
-        note_pattern = re.compile(r"-([A-Ga-g][#b]?\d+)-", re.IGNORECASE)
-        sample_match = note_pattern.search(sample_name)
+        sample_match = _SAMPLE_NOTE_PATTERN.search(sample_name)
         if sample_match:
-            sample_note = sample_match.group(1).upper()
-            for filename in dir_contents:
-                file_match = note_pattern.search(filename)
-                if file_match and file_match.group(1).upper() == sample_note:
-                    return os.path.join(search_dir, filename)
+            filename = note_map.get(sample_match.group(1).upper())
+            if filename is not None:
+                return os.path.join(search_dir, filename)
 
     return None
 
 
+def _wav_has_only_audio_chunks(wav_path):
+    """Check that a WAV file holds nothing but its fmt and data chunks.
+
+    Extra chunks (smpl, cue, LIST, ...) would carry over verbatim if the file
+    were copied, so callers use this to decide whether copying is safe.
+
+    Args:
+        wav_path: Path to WAV file
+
+    Returns:
+        bool: True if the only chunks are "fmt " and "data"
+    """
+    with open(wav_path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            return False
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return True
+            if chunk_header[:4] not in (b"fmt ", b"data"):
+                return False
+            chunk_size = _U32_STRUCT.unpack_from(chunk_header, 4)[0]
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
 def convert_to_wav(source_path, dest_path, target_rate=None):
     """Convert audio file to WAV using ffmpeg.
 
@@ -1065,6 +1351,32 @@ def convert_to_wav(source_path, dest_path, target_rate=None):
     Returns:
         tuple: (success, original_rate, output_rate)
     """
+    # Fast path: a 24-bit PCM WAV that needs no resampling and has no chunks
+    # besides fmt/data already holds exactly the audio ffmpeg would write, so
+    # copy it instead of running ffmpeg. Files with smpl/cue/LIST chunks go through
+    # ffmpeg so stale loop metadata is never carried into the output.
+    # (Copied rather than hard-linked so the source library is never modified.)
+    if source_path.lower().endswith(".wav"):
+        wav_rate = None
+        try:
+            import wave
+
+            with wave.open(source_path, "rb") as w:
+                if w.getsampwidth() == 3:
+                    wav_rate = w.getframerate()
+            if wav_rate and not _wav_has_only_audio_chunks(source_path):
+                wav_rate = None
+        except (wave.Error, EOFError, OSError):
+            wav_rate = None
+        if wav_rate and (not target_rate or target_rate == wav_rate):
+            import shutil
+
+            try:
+                shutil.copyfile(source_path, dest_path)
+                return (True, wav_rate, wav_rate)
+            except OSError:
+                pass
+
     original_rate = get_sample_rate(source_path)
     if original_rate is None:
         original_rate = 44100  # Fallback
@@ -1089,171 +1401,168 @@ def convert_to_wav(source_path, dest_path, target_rate=None):
         raise FFmpegNotFoundError("ffmpeg not found. Please install ffmpeg.")
 
 
+def _link_or_copy_file(src_path, dest_path):
+    """Link dest_path to src_path, or copy it where hard links are unsupported.
+
+    Args:
+        src_path: Existing file
+        dest_path: New file to create
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    import shutil
+
+    try:
+        os.link(src_path, dest_path)
+        return True
+    except OSError:
+        pass
+    try:
+        shutil.copyfile(src_path, dest_path)
+        return True
+    except OSError:
+        return False
+
+
 # =============================================================================
 # EXS24 Parser
 # =============================================================================
 
+# Little-endian uint32 reader (chunk signatures)
+_U32_UNPACK = _U32_STRUCT.unpack_from
+
+# Chunk header fields at offset 4: body size, chunk id
+_CHUNK_HEADER_STRUCT = struct.Struct("<II")
+
+# Chunk field layouts, decoded in one call per chunk.
+# Zone fields start at chunk offset 84 (flags) and end at 180 (sampleindex).
+_ZONE_STRUCT = struct.Struct(
+    "<"
+    "B"  # 84: flags (bit0 = pitch tracking off, bit1 = oneshot)
+    "B"  # 85: rootnote
+    "b"  # 86: finetune
+    "b"  # 87: pan
+    "b"  # 88: volumeadjust
+    "x"
+    "B"  # 90: startnote
+    "B"  # 91: endnote
+    "x"
+    "B"  # 93: minvel
+    "B"  # 94: maxvel
+    "x"
+    "i"  # 96: samplestart
+    "i"  # 100: sampleend
+    "i"  # 104: loopstart
+    "i"  # 108: loopend
+    "i"  # 112: loopcrossfade
+    "x"
+    "B"  # 117: loopopts
+    "54x"
+    "i"  # 172: group
+    "I"  # 176: sampleindex
+)
+
+# Group fields from chunk offset 0 through 168 (enable_by_type)
+_GROUP_STRUCT = struct.Struct(
+    "<"
+    "86x"
+    "B"  # 86: polyphony
+    "70x"
+    "B"  # 157: trigger
+    "B"  # 158: output
+    "5x"
+    "i"  # 164: sequence (round-robin position)
+    "B"  # 168: enable_by_type
+)
+
+# Sample fields from chunk offset 0 through 96 (bitdepth)
+_SAMPLE_STRUCT = struct.Struct(
+    "<"
+    "88x"
+    "i"  # 88: length
+    "i"  # 92: rate
+    "B"  # 96: bitdepth
+)
+
+
+def _decode_cstring(raw, start, length, errors="strict"):
+    """Decode a NUL-terminated UTF-8 string from a fixed-size field.
+
+    Only the bytes before the terminator are copied out of ``raw``.
+    """
+    end = min(start + length, len(raw))
+    nul = raw.find(b"\x00", start, end)
+    if nul < 0:
+        nul = end
+    return raw[start:nul].decode("utf-8", errors)
+
 
 class EXSChunk:
     """Base class for EXS24 chunks."""
 
-    _size = None
+    def __init__(self, instrument, offset):
+        self.instrument = instrument
+        self.offset = offset
+        body_size, self.id = _CHUNK_HEADER_STRUCT.unpack_from(
+            instrument.data, offset + 4
+        )
+        # 84-byte chunk header + body
+        self.size = 84 + body_size
+        self.name = _decode_cstring(instrument.raw, offset + 20, 64, errors="replace")
 
     @classmethod
     def parse(cls, instrument, offset):
-        sig = struct.unpack_from("<I", instrument.data, offset)[0]
-        for subclass in cls.__subclasses__():
-            if subclass.sig is None:
-                continue
-            if subclass.sig == sig:
-                return subclass(instrument, offset)
-            if hasattr(subclass, "sig_new") and subclass.sig_new == sig:
-                return subclass(instrument, offset)
-        return EXSUnknown(instrument, offset)
-
-    @property
-    def size(self):
-        if self._size is None:
-            self._size = (
-                84 + struct.unpack_from("<I", self.instrument.data, self.offset + 4)[0]
-            )
-        return self._size
-
-    @property
-    def id(self):
-        return struct.unpack_from("<I", self.instrument.data, self.offset + 8)[0]
-
-    @property
-    def name(self):
-        raw = self.instrument.data[self.offset + 20 : self.offset + 84]
-        return raw.decode("utf-8").split("\x00")[0]
+        sig = _U32_UNPACK(instrument.data, offset)[0]
+        return _SIG_TABLE.get(sig, EXSUnknown)(instrument, offset)
 
 
 class EXSHeader(EXSChunk):
     sig = 0x00000101
     sig_new = 0x40000101
 
-    def __init__(self, instrument, offset):
-        self.instrument = instrument
-        self.offset = offset
-
 
 class EXSZone(EXSChunk):
     sig = 0x01000101
     sig_new = 0x41000101
 
     def __init__(self, instrument, offset):
-        self.instrument = instrument
-        self.offset = offset
-
-    def _read_byte(self, rel_offset):
-        return struct.unpack_from("B", self.instrument.data, self.offset + rel_offset)[
-            0
-        ]
-
-    def _read_sbyte(self, rel_offset):
-        return struct.unpack_from("b", self.instrument.data, self.offset + rel_offset)[
-            0
-        ]
-
-    def _read_int(self, rel_offset):
-        return struct.unpack_from("<i", self.instrument.data, self.offset + rel_offset)[
-            0
-        ]
-
-    def _read_uint(self, rel_offset):
-        return struct.unpack_from("<I", self.instrument.data, self.offset + rel_offset)[
-            0
-        ]
-
-    @property
-    def rootnote(self):
-        return self._read_byte(85)
-
-    @property
-    def finetune(self):
-        return self._read_sbyte(86)
-
-    @property
-    def pan(self):
-        return self._read_sbyte(87)
-
-    @property
-    def volumeadjust(self):
-        return self._read_sbyte(88)
-
-    @property
-    def startnote(self):
-        return self._read_byte(90)
-
-    @property
-    def endnote(self):
-        return self._read_byte(91)
-
-    @property
-    def minvel(self):
-        return self._read_byte(93)
-
-    @property
-    def maxvel(self):
-        return self._read_byte(94)
-
-    @property
-    def samplestart(self):
-        return self._read_int(96)
-
-    @property
-    def sampleend(self):
-        return self._read_int(100)
-
-    @property
-    def loopstart(self):
-        return self._read_int(104)
-
-    @property
-    def loopend(self):
-        return self._read_int(108)
-
-    @property
-    def loopcrossfade(self):
-        return self._read_int(112)
-
-    @property
-    def loopopts(self):
-        return self._read_byte(117)
-
-    @property
-    def loop(self):
-        return (self.loopopts & 1) != 0
-
-    @property
-    def loop_equal_power(self):
-        return (self.loopopts & 2) != 0
-
-    @property
-    def loop_play_to_end_on_release(self):
-        """EXS24: true = stop looping on release. INVERSE of elmulti."""
-        return (self.loopopts & 4) != 0
-
-    @property
-    def pitchtrack(self):
-        return not (self._read_byte(84) & 1)
-
-    @property
-    def oneshot(self):
-        return self._read_byte(84) & 2
+        super().__init__(instrument, offset)
+        (
+            flags,
+            self.rootnote,
+            self.finetune,
+            self.pan,
+            self.volumeadjust,
+            self.startnote,
+            self.endnote,
+            self.minvel,
+            self.maxvel,
+            self.samplestart,
+            self.sampleend,
+            self.loopstart,
+            self.loopend,
+            self.loopcrossfade,
+            self.loopopts,
+            self._group,
+            self.sampleindex,
+        ) = _ZONE_STRUCT.unpack_from(instrument.data, offset + 84)
+
+        self.loop = (self.loopopts & 1) != 0
+        self.loop_equal_power = (self.loopopts & 2) != 0
+        # EXS24: true = stop looping on release. INVERSE of elmulti.
+        self.loop_play_to_end_on_release = (self.loopopts & 4) != 0
+        self.pitchtrack = not (flags & 1)
+        self.oneshot = flags & 2
 
     @property
     def group(self):
-        group = self._read_int(172)
-        if group >= 0:
-            return group
+        # Negative group = last group; resolved lazily since groups may
+        # follow zones in the chunk stream.
+        if self._group >= 0:
+            return self._group
         return len(self.instrument.groups) - 1
 
-    @property
-    def sampleindex(self):
-        return self._read_uint(176)
-
 
 class EXSGroup(EXSChunk):
     sig = 0x02000101
@@ -1269,50 +1578,28 @@ class EXSGroup(EXSChunk):
     ENABLE_BY_TEMPO = 7
 
     def __init__(self, instrument, offset):
-        self.instrument = instrument
-        self.offset = offset
-
-    @property
-    def polyphony(self):
-        return struct.unpack_from("B", self.instrument.data, self.offset + 86)[0]
-
-    @property
-    def trigger(self):
-        return struct.unpack_from("B", self.instrument.data, self.offset + 157)[0]
-
-    @property
-    def output(self):
-        return struct.unpack_from("B", self.instrument.data, self.offset + 158)[0]
-
-    @property
-    def sequence(self):
-        return struct.unpack_from("<i", self.instrument.data, self.offset + 164)[0]
-
-    @property
-    def enable_by_type(self):
-        try:
-            if len(self.instrument.data) > self.offset + 168:
-                return struct.unpack_from("B", self.instrument.data, self.offset + 168)[
-                    0
-                ]
-        except Exception:
-            pass
-        return 0
-
-    @property
-    def round_robin_position(self):
-        try:
-            if len(self.instrument.data) > self.offset + 167:
-                return struct.unpack_from(
-                    "<i", self.instrument.data, self.offset + 164
-                )[0]
-        except Exception:
-            pass
-        return -1
-
-    @property
-    def is_round_robin(self):
-        return self.enable_by_type == self.ENABLE_BY_ROUND_ROBIN
+        super().__init__(instrument, offset)
+        data = instrument.data
+        # Bytes available from the start of this chunk, checked once
+        data_len = len(data) - offset
+
+        if data_len >= _GROUP_STRUCT.size:
+            (
+                self.polyphony,
+                self.trigger,
+                self.output,
+                self.sequence,
+                self.enable_by_type,
+            ) = _GROUP_STRUCT.unpack_from(data, offset)
+        else:
+            # Truncated chunk at end of file: fall back to safe defaults
+            self.polyphony = self.trigger = self.output = 0
+            self.enable_by_type = 0
+            self.sequence = -1
+            if data_len >= 168:
+                self.sequence = _I32_STRUCT.unpack_from(data, offset + 164)[0]
+        self.round_robin_position = self.sequence
+        self.is_round_robin = self.enable_by_type == self.ENABLE_BY_ROUND_ROBIN
 
 
 class EXSSample(EXSChunk):
@@ -1320,122 +1607,125 @@ class EXSSample(EXSChunk):
     sig_new = 0x43000101
 
     def __init__(self, instrument, offset):
-        self.instrument = instrument
-        self.offset = offset
-
-    @property
-    def length(self):
-        return struct.unpack_from("<i", self.instrument.data, self.offset + 88)[0]
-
-    @property
-    def rate(self):
-        return struct.unpack_from("<i", self.instrument.data, self.offset + 92)[0]
-
-    @property
-    def bitdepth(self):
-        return struct.unpack_from("B", self.instrument.data, self.offset + 96)[0]
+        super().__init__(instrument, offset)
+        self.length, self.rate, self.bitdepth = _SAMPLE_STRUCT.unpack_from(
+            instrument.data, offset
+        )
 
-    @property
-    def file_path(self):
-        """Full file path stored in sample chunk (offset 164, 256 bytes)."""
-        raw = self.instrument.data[self.offset + 164 : self.offset + 164 + 256]
-        return raw.decode("utf-8", errors="ignore").split("\x00")[0]
+        # Full file path stored in sample chunk (offset 164, 256 bytes)
+        self.file_path = _decode_cstring(
+            instrument.raw, offset + 164, 256, errors="ignore"
+        )
 
-    @property
-    def file_name(self):
-        """File name stored in sample chunk (offset 420, 256 bytes)."""
-        if len(self.instrument.data) > self.offset + 420:
-            raw = self.instrument.data[self.offset + 420 : self.offset + 420 + 256]
-            name = raw.decode("utf-8", errors="ignore").split("\x00")[0]
-            if name:
-                return name
-        return self.name  # Fallback to chunk name
+        # File name stored in sample chunk (offset 420, 256 bytes),
+        # falling back to the chunk name
+        file_name = ""
+        if len(instrument.data) > offset + 420:
+            file_name = _decode_cstring(
+                instrument.raw, offset + 420, 256, errors="ignore"
+            )
+        self.file_name = file_name or self.name
 
 
 class EXSParam(EXSChunk):
     sig = 0x04000101
     sig_new = 0x44000101
 
-    def __init__(self, instrument, offset):
-        self.instrument = instrument
-        self.offset = offset
-
 
 class EXSUnknown(EXSChunk):
     sig = None
 
     def __init__(self, instrument, offset):
+        # Unknown chunks are only skipped over: read the size, defer the name
         self.instrument = instrument
         self.offset = offset
+        body_size, self.id = _CHUNK_HEADER_STRUCT.unpack_from(
+            instrument.data, offset + 4
+        )
+        self.size = 84 + body_size
+
+    @property
+    def name(self):
+        return _decode_cstring(
+            self.instrument.raw, self.offset + 20, 64, errors="replace"
+        )
+
+
+# Chunk signature (old and new format) -> chunk class
+_SIG_TABLE = {}
+for _chunk_cls in (EXSHeader, EXSZone, EXSGroup, EXSSample, EXSParam):
+    _SIG_TABLE[_chunk_cls.sig] = _chunk_cls
+    _SIG_TABLE[_chunk_cls.sig_new] = _chunk_cls
+del _chunk_cls
 
 
 class EXSInstrument:
-    """EXS24 instrument file parser."""
+    """EXS24 instrument file parser.
+
+    The chunk stream is parsed exactly once, in __init__, into the plain
+    lists objects, zones, groups and samples.
+    """
 
     def __init__(self, exsfile_name):
-        self._zones = None
-        self._groups = None
-        self._samples = None
-        self._objects = None
         self.exsfile_name = exsfile_name
-        self.data = None
-
-        if os.stat(exsfile_name).st_size > 1024 * 1024:
-            raise RuntimeError("EXS file is too large (> 1MB)")
+        self.raw = None  # file contents (bytes)
+        self.data = None  # memoryview over raw (no-copy slicing/unpacking)
+        self.objects = []
+        self.zones = []
+        self.groups = []
+        self.samples = []
+
+        file_size = os.stat(exsfile_name).st_size
+        if file_size > MAX_EXS_FILE_SIZE:
+            raise RuntimeError(
+                f"EXS file is too large (> {MAX_EXS_FILE_SIZE // (1024 * 1024)}MB)"
+            )
 
         with open(exsfile_name, "rb") as exsfile:
-            self.data = exsfile.read(84)
-            sig = struct.unpack_from("<I", self.data, 0)[0]
+            raw = exsfile.read(84)
+            sig = _U32_UNPACK(raw, 0)[0]
             if (
-                struct.unpack_from(">I", self.data, 0)[0] == EXSHeader.sig
-                and self.data[16:20] == b"SOBT"
+                _U32_BE_STRUCT.unpack_from(raw, 0)[0] == EXSHeader.sig
+                and raw[16:20] == b"SOBT"
             ):
                 raise RuntimeError("Big endian EXS files are not supported")
             if (
                 not (sig == EXSHeader.sig or sig == EXSHeader.sig_new)
-                and self.data[16:20] == b"TBOS"
+                and raw[16:20] == b"TBOS"
             ):
                 raise RuntimeError("Not a valid EXS file")
-            self.data += exsfile.read(1024 * 1024 - 84)
-
-    @property
-    def objects(self):
-        if not self._objects:
-            self._objects = []
-            offset = 0
-            end = len(self.data)
-            while offset < end:
-                new_object = EXSChunk.parse(self, offset)
-                self._objects.append(new_object)
-                offset += new_object.size
-                if isinstance(new_object, EXSZone):
-                    self.zones.append(new_object)
-                elif isinstance(new_object, EXSGroup):
-                    self.groups.append(new_object)
-                elif isinstance(new_object, EXSSample):
-                    self.samples.append(new_object)
-        return self._objects
-
-    @property
-    def zones(self):
-        if not self._zones:
-            self._zones = []
-            len(self.objects)  # trigger parsing
-        return self._zones
-
-    @property
-    def samples(self):
-        if not self._samples:
-            self._samples = []
-            len(self.objects)
-        return self._samples
+            # Read the remainder in one call sized to the actual file
+            raw += exsfile.read(max(0, file_size - 84))
+
+        self.raw = raw
+        self.data = memoryview(raw)
+
+        self._parse_all()
+
+    def _parse_all(self):
+        """Walk the chunk stream once, classifying every chunk."""
+        # Hot loop: bind lookups locally and classify by exact class
+        # (one dict probe) instead of an isinstance() chain
+        data = self.data
+        read_sig = _U32_UNPACK
+        lookup_cls = _SIG_TABLE.get
+        objects = self.objects
+        lists_by_cls = {
+            EXSZone: self.zones,
+            EXSGroup: self.groups,
+            EXSSample: self.samples,
+        }
 
-    @property
-    def groups(self):
-        if not self._groups:
-            self._groups = []
-            len(self.objects)
-        return self._groups
+        offset = 0
+        end = len(data)
+        while offset < end:
+            chunk_cls = lookup_cls(read_sig(data, offset)[0], EXSUnknown)
+            new_object = chunk_cls(self, offset)
+            objects.append(new_object)
+            offset += new_object.size
+            chunk_list = lists_by_cls.get(chunk_cls)
+            if chunk_list is not None:
+                chunk_list.append(new_object)
 
 
 # =============================================================================
@@ -1459,6 +1749,34 @@ class EXSInstrument:
 #
 # =============================================================================
 
+# Canonical zone order (pitch, velocity, round-robin position). itemgetter
+# builds the key tuple in C instead of a lambda doing three dict lookups.
+_ZONE_SORT_KEY = itemgetter("pitch", "minvel", "rr_position")
+
+
+def assign_velocity_layers(zone_data):
+    """Set each zone's "vel_layer" to the rank of its minvel at its pitch.
+
+    Zones must already be sorted by (pitch, minvel), as parse_exs() and
+    parse_sfz() do, so layers can be assigned in a single run-length pass.
+
+    Args:
+        zone_data: List of zone data dictionaries (modified in-place)
+    """
+    prev_pitch = prev_minvel = None
+    layer = -1
+    for zd in zone_data:
+        pitch = zd["pitch"]
+        minvel = zd["minvel"]
+        if pitch != prev_pitch:
+            prev_pitch = pitch
+            prev_minvel = minvel
+            layer = 0
+        elif minvel != prev_minvel:
+            prev_minvel = minvel
+            layer += 1
+        zd["vel_layer"] = layer
+
 
 def parse_exs(exs_path):
     """Parse EXS24 file and return zone data list.
@@ -1481,51 +1799,54 @@ def parse_exs(exs_path):
     sample_paths = {}
     missing = []
 
+    # Fallback search directories shared by all samples, and listing
+    # caches so each directory is read once per instrument
+    base_search_dirs = [
+        exs_dir,
+        os.path.join(exs_dir, exs_basename),
+        os.path.join(exs_dir, "..", exs_basename),
+        os.path.join(exs_dir, "..", "Samples", exs_basename),
+    ]
+    dir_cache = {}
+    entry_cache = {}
+
     for sample in exs.samples:
         found = None
+        sample_name = sample.name
+        raw_file_path = sample.file_path
+        file_name = sample.file_name or sample_name
+
+        # Normalize Windows-style path separators
+        file_path = raw_file_path.replace("\\", "/")
 
         # 1. Try file_path from EXS (may be absolute or relative)
-        if sample.file_path:
-            # Normalize Windows-style path separators
-            file_path = sample.file_path.replace("\\", "/")
-            file_name = (sample.file_name or sample.name).replace("\\", "/")
+        if file_path:
+            file_name_norm = file_name.replace("\\", "/")
             # file_path may be directory or full path
             if os.path.isabs(file_path):
-                # Try as full file path first
-                if os.path.isfile(file_path):
-                    found = file_path
-                # Try as directory + filename
-                elif os.path.isdir(file_path):
-                    full_path = os.path.join(file_path, file_name)
-                    if os.path.isfile(full_path):
-                        found = full_path
+                base_path = file_path
             else:
                 # Try as relative path from EXS directory
-                rel_path = os.path.join(exs_dir, file_path)
-                rel_path = os.path.normpath(rel_path)
-                if os.path.isfile(rel_path):
-                    found = rel_path
-                elif os.path.isdir(rel_path):
-                    full_path = os.path.join(rel_path, file_name)
-                    if os.path.isfile(full_path):
-                        found = full_path
+                base_path = os.path.normpath(os.path.join(exs_dir, file_path))
+            # Try as full file path first, then as directory + filename
+            kind = _path_kind(base_path, entry_cache)
+            if kind == "file":
+                found = base_path
+            elif kind == "dir":
+                full_path = os.path.join(base_path, file_name_norm)
+                if _path_kind(full_path, entry_cache) == "file":
+                    found = full_path
 
         # 2. Fallback: search in common directories by filename
         if not found:
-            search_dirs = [
-                exs_dir,
-                os.path.join(exs_dir, exs_basename),
-                os.path.join(exs_dir, "..", exs_basename),
-                os.path.join(exs_dir, "..", "Samples", exs_basename),
-            ]
+            search_dirs = list(base_search_dirs)
 
             # 3. Extract relative path hints from file_path and search ancestors
             # Many sample libraries store samples in parallel directories like:
             #   LibraryRoot/Logic EXS/... (EXS files)
             #   LibraryRoot/WAV/...       (sample files)
-            if sample.file_path:
-                fp = sample.file_path.replace("\\", "/")
-                path_parts = [p for p in fp.split("/") if p]
+            if file_path:
+                path_parts = [p for p in file_path.split("/") if p]
 
                 # Try last 1-4 directory components as relative path
                 for depth in range(1, min(5, len(path_parts))):
@@ -1537,24 +1858,26 @@ def parse_exs(exs_path):
                         candidate = os.path.normpath(
                             os.path.join(current_dir, rel_subpath)
                         )
-                        if os.path.isdir(candidate) and candidate not in search_dirs:
+                        if (
+                            candidate not in search_dirs
+                            and _path_kind(candidate, entry_cache) == "dir"
+                        ):
                             search_dirs.append(candidate)
                         parent = os.path.dirname(current_dir)
                         if parent == current_dir:
                             break
                         current_dir = parent
 
-            file_name = sample.file_name or sample.name
-            found = find_sample_file(file_name, search_dirs)
+            found = find_sample_file(file_name, search_dirs, dir_cache)
 
         if found:
-            sample_paths[sample.name] = found
-            print(f"  [OK] {sample.name}")
+            sample_paths[sample_name] = found
+            print(f"  [OK] {sample_name}")
         else:
-            missing.append(sample.name)
-            print(f"  [NG] {sample.name}")
-            if sample.file_path:
-                print(f"       (file_path: {sample.file_path})")
+            missing.append(sample_name)
+            print(f"  [NG] {sample_name}")
+            if raw_file_path:
+                print(f"       (file_path: {raw_file_path})")
 
     if missing:
         missing_list = ", ".join(missing[:5])
@@ -1568,20 +1891,25 @@ def parse_exs(exs_path):
         if group.is_round_robin:
             print(f"  Group {i}: Round-robin position {group.round_robin_position}")
 
+    # Per-group round-robin position and per-sample (name, path, rate),
+    # computed once and indexed by each zone
+    group_rr = [
+        group.round_robin_position if group.is_round_robin else -1
+        for group in exs.groups
+    ]
+    num_groups = len(group_rr)
+    sample_info = [
+        (sample.name, sample_paths[sample.name], sample.rate) for sample in exs.samples
+    ]
+
     # Build zone data
     zone_data = []
     for zone in exs.zones:
-        sample = exs.samples[zone.sampleindex]
-        sample_name = sample.name
-        source_path = sample_paths[sample_name]
+        sample_name, source_path, original_rate = sample_info[zone.sampleindex]
 
         # Get round-robin info from group
         group_idx = zone.group
-        rr_position = -1
-        if 0 <= group_idx < len(exs.groups):
-            group = exs.groups[group_idx]
-            if group.is_round_robin:
-                rr_position = group.round_robin_position
+        rr_position = group_rr[group_idx] if 0 <= group_idx < num_groups else -1
 
         zone_data.append(
             {
@@ -1599,28 +1927,15 @@ def parse_exs(exs_path):
                 "loop_crossfade_ms": zone.loopcrossfade,
                 "keep_looping_on_release": not zone.loop_play_to_end_on_release,
                 "rr_position": rr_position,
-                "original_rate": sample.rate,
+                "original_rate": original_rate,
             }
         )
 
     # Sort by pitch, velocity, round-robin position
-    zone_data.sort(key=lambda z: (z["pitch"], z["minvel"], z["rr_position"]))
+    zone_data.sort(key=_ZONE_SORT_KEY)
 
     # Assign velocity layer indices
-    vel_layers_by_pitch = defaultdict(list)
-    for zd in zone_data:
-        pitch = zd["pitch"]
-        minvel = zd["minvel"]
-        if minvel not in vel_layers_by_pitch[pitch]:
-            vel_layers_by_pitch[pitch].append(minvel)
-
-    for pitch in vel_layers_by_pitch:
-        vel_layers_by_pitch[pitch].sort()
-
-    for zd in zone_data:
-        pitch = zd["pitch"]
-        minvel = zd["minvel"]
-        zd["vel_layer"] = vel_layers_by_pitch[pitch].index(minvel)
+    assign_velocity_layers(zone_data)
 
     return zone_data, instrument_name
 
@@ -1629,6 +1944,21 @@ def parse_exs(exs_path):
 # SFZ Parser
 # =============================================================================
 
+# One tokenizer for the whole file: a comment (// or /* */, skipped), a
+# header tag, or an opcode=value pair. Values may contain spaces (sample
+# paths) and end at the next opcode, header, comment or the end of the file.
+_SFZ_TOKEN_PATTERN = re.compile(
+    r"//[^\n]*|/\*.*?\*/"
+    r"|<(control|global|master|group|region)>"
+    r"|(\w+)=([^=]+?)"
+    r"(?=\s+\w+=|\s*<(?:control|global|master|group|region)>|\s*/[/*]|\Z)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Scientific pitch notation (e.g., C4, F#3, Bb-1)
+_IPN_NOTE_PATTERN = re.compile(r"([A-Ga-g])([#b]?)(-?\d+)")
+_IPN_NOTE_OFFSETS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
 
 def parse_sfz(sfz_path):
     """Parse SFZ file and return zone data list.
@@ -1645,21 +1975,11 @@ def parse_sfz(sfz_path):
     sfz_basename = os.path.splitext(os.path.basename(sfz_path))[0]
     instrument_name = sfz_basename
 
-    # Read and preprocess SFZ file
+    # Read SFZ file (comments are skipped by the tokenizer, so no
+    # comment-stripped copy of the text is built)
     with open(sfz_path, "r", encoding="utf-8", errors="ignore") as f:
         content = f.read()
 
-    # Remove comments
-    content = re.sub(r"//[^\n]*", "", content)
-    content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
-
-    # Parse headers and opcodes
-    # Split by headers while keeping the header names
-    header_pattern = re.compile(
-        r"<(control|global|master|group|region)>", re.IGNORECASE
-    )
-    parts = header_pattern.split(content)
-
     # Build scoped opcode storage
     control_opcodes = {}
     global_opcodes = {}
@@ -1667,32 +1987,38 @@ def parse_sfz(sfz_path):
     group_opcodes = {}
     regions = []
 
+    def flush_header(header, opcodes):
+        nonlocal control_opcodes, global_opcodes, master_opcodes, group_opcodes
+        if header == "control":
+            control_opcodes = opcodes
+        elif header == "global":
+            global_opcodes = opcodes
+        elif header == "master":
+            master_opcodes = opcodes
+        elif header == "group":
+            group_opcodes = opcodes
+        elif header == "region":
+            # Merge inherited opcodes
+            merged = {}
+            merged.update(global_opcodes)
+            merged.update(master_opcodes)
+            merged.update(group_opcodes)
+            merged.update(opcodes)
+            regions.append(merged)
+
+    # Parse headers and opcodes in a single scan. Opcodes before the
+    # first header belong to no header and are ignored.
     current_header = None
-    i = 0
-    while i < len(parts):
-        part = parts[i].strip()
-        if header_pattern.match(f"<{part}>"):
-            current_header = part.lower()
-            i += 1
-            if i < len(parts):
-                opcodes = parse_sfz_opcodes(parts[i])
-                if current_header == "control":
-                    control_opcodes = opcodes
-                elif current_header == "global":
-                    global_opcodes = opcodes
-                elif current_header == "master":
-                    master_opcodes = opcodes
-                elif current_header == "group":
-                    group_opcodes = opcodes
-                elif current_header == "region":
-                    # Merge inherited opcodes
-                    merged = {}
-                    merged.update(global_opcodes)
-                    merged.update(master_opcodes)
-                    merged.update(group_opcodes)
-                    merged.update(opcodes)
-                    regions.append(merged)
-        i += 1
+    opcodes = {}
+    for match in _SFZ_TOKEN_PATTERN.finditer(content):
+        header, key, value = match.groups()
+        if key is not None:
+            opcodes[key.lower()] = value.strip()
+        elif header is not None:
+            flush_header(current_header, opcodes)
+            current_header = header.lower()
+            opcodes = {}
+    flush_header(current_header, opcodes)
 
     # Get default_path from control (normalize Windows-style paths)
     default_path = control_opcodes.get("default_path", "").replace("\\", "/")
@@ -1701,6 +2027,8 @@ def parse_sfz(sfz_path):
     print(f"Checking {len(regions)} regions...")
     zone_data = []
     missing = []
+    # Directory listings shared by all regions (one scandir per directory)
+    entry_cache = {}
 
     for region in regions:
         sample_opcode = region.get("sample")
@@ -1718,7 +2046,7 @@ def parse_sfz(sfz_path):
         sample_path = os.path.join(sfz_dir, sample_rel)
         sample_path = os.path.normpath(sample_path)
 
-        if not os.path.isfile(sample_path):
+        if _path_kind(sample_path, entry_cache) != "file":
             missing.append(sample_rel)
             print(f"  [NG] {sample_rel}")
             print(f"       (sample opcode: {sample_opcode})")
@@ -1802,50 +2130,15 @@ def parse_sfz(sfz_path):
         raise ConversionError(f"{len(missing)} sample(s) not found: {missing_list}")
 
     # Sort by pitch, velocity, round-robin position
-    zone_data.sort(key=lambda z: (z["pitch"], z["minvel"], z["rr_position"]))
+    zone_data.sort(key=_ZONE_SORT_KEY)
 
     # Assign velocity layer indices
-    vel_layers_by_pitch = defaultdict(list)
-    for zd in zone_data:
-        pitch = zd["pitch"]
-        minvel = zd["minvel"]
-        if minvel not in vel_layers_by_pitch[pitch]:
-            vel_layers_by_pitch[pitch].append(minvel)
-
-    for pitch in vel_layers_by_pitch:
-        vel_layers_by_pitch[pitch].sort()
-
-    for zd in zone_data:
-        pitch = zd["pitch"]
-        minvel = zd["minvel"]
-        zd["vel_layer"] = vel_layers_by_pitch[pitch].index(minvel)
+    assign_velocity_layers(zone_data)
 
     print(f"\nParsed {len(zone_data)} zones")
     return zone_data, instrument_name
 
 
-def parse_sfz_opcodes(text):
-    """Parse SFZ opcodes from text block.
-
-    Args:
-        text: Text containing opcode=value pairs
-
-    Returns:
-        dict: Opcode name to value mapping
-    """
-    opcodes = {}
-    # Match opcode=value, handling spaces in sample paths
-    # Opcodes end at next opcode or end of string
-    pattern = re.compile(r"(\w+)=([^=]+?)(?=\s+\w+=|$)", re.DOTALL)
-
-    for match in pattern.finditer(text):
-        key = match.group(1).lower()
-        value = match.group(2).strip()
-        opcodes[key] = value
-
-    return opcodes
-
-
 def parse_sfz_note(note_str):
     """Parse SFZ note value (MIDI number or IPN notation).
 
@@ -1864,14 +2157,13 @@ def parse_sfz_note(note_str):
         pass
 
     # Parse IPN notation (e.g., C4, F#3, Bb2)
-    match = re.match(r"([A-Ga-g])([#b]?)(-?\d+)", note_str)
+    match = _IPN_NOTE_PATTERN.match(note_str)
     if match:
         note_name = match.group(1).upper()
         accidental = match.group(2)
         octave = int(match.group(3))
 
-        note_map = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
-        midi = note_map[note_name] + (octave + 1) * 12
+        midi = _IPN_NOTE_OFFSETS[note_name] + (octave + 1) * 12
 
         if accidental == "#":
             midi += 1
@@ -1915,7 +2207,12 @@ def analyze_sample_map(zone_data):
             "has_round_robin": False,
         }
 
-    unique_pitches = sorted(set(zd["pitch"] for zd in zone_data))
+    # One pass over the zones: distinct (pitch, minvel) pairs give both the
+    # pitch set and the number of velocity layers at each pitch
+    layer_keys = {(zd["pitch"], zd["minvel"]) for zd in zone_data}
+    layers_per_pitch = Counter(pitch for pitch, _ in layer_keys)
+
+    unique_pitches = sorted(layers_per_pitch)
     pitch_count = len(unique_pitches)
 
     # Calculate most common interval (mode)
@@ -1928,14 +2225,7 @@ def analyze_sample_map(zone_data):
         interval = 0
 
     # Estimate velocity layers (max layers at any pitch)
-    vel_layers_by_pitch = {}
-    for zd in zone_data:
-        pitch = zd["pitch"]
-        minvel = zd["minvel"]
-        if pitch not in vel_layers_by_pitch:
-            vel_layers_by_pitch[pitch] = set()
-        vel_layers_by_pitch[pitch].add(minvel)
-    velocity_layers = max(len(v) for v in vel_layers_by_pitch.values())
+    velocity_layers = max(layers_per_pitch.values())
 
     # Check for round-robin
     has_round_robin = any(zd["rr_position"] >= 0 for zd in zone_data)
@@ -2138,6 +2428,7 @@ def write_elmulti(
     embed_loop=True,
     prefix="",
     normalize_db=None,
+    loop_len_align=0,
 ):
     """Convert zone data to elmulti format with WAV files.
 
@@ -2154,6 +2445,8 @@ def write_elmulti(
         embed_loop: Embed loop info (smpl chunk) into WAV files (default: True)
         prefix: Prefix to add to instrument name and filenames (default: "")
         normalize_db: Target peak level for normalization in dB (None = disabled)
+        loop_len_align: Constrain optimized loop length to a multiple of N
+            samples, choosing the aligned end with the lowest click (0 to disable)
 
     Returns:
         dict: Summary statistics
@@ -2173,7 +2466,11 @@ def write_elmulti(
     sample_counter = defaultdict(int)
     resampled_count = 0
 
-    # Convert samples and update zone_data with output info
+    # Assign output filenames and collect the conversions to run. Zones that
+    # share a source file are converted once and the result is reused.
+    pending = {}  # dest_path -> zone data that converts it
+    converted_from = {}  # source_path -> dest_path of its conversion
+    copies = {}  # dest_path -> dest_path of the same source's conversion
     for zd in zone_data:
         pitch = zd["pitch"]
         vel_layer = zd["vel_layer"]
@@ -2191,12 +2488,37 @@ def write_elmulti(
         new_filename = (
             f"{safe_name}-{vel_layer:03d}-{pitch:03d}-{note_name}{rr_suffix}.wav"
         )
+        zd["new_filename"] = new_filename
         dest_path = os.path.join(output_dir, new_filename)
+        if dest_path in pending or os.path.exists(dest_path):
+            continue
+        pending[dest_path] = zd
+        source_path = zd["source_path"]
+        if source_path in converted_from:
+            copies[dest_path] = converted_from[source_path]
+        else:
+            converted_from[source_path] = dest_path
+
+    # Each conversion is an independent ffmpeg process, so run them
+    # concurrently; threads suffice as the work happens out of process
+    futures = {}
+    if pending:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            for source_path, dest_path in converted_from.items():
+                futures[dest_path] = executor.submit(
+                    convert_to_wav, source_path, dest_path, target_rate
+                )
 
-        if not os.path.exists(dest_path):
-            success, original_rate, output_rate = convert_to_wav(
-                zd["source_path"], dest_path, target_rate
-            )
+    # Update zone_data with output info (in zone order)
+    for zd in zone_data:
+        new_filename = zd["new_filename"]
+        dest_path = os.path.join(output_dir, new_filename)
+
+        if pending.get(dest_path) is zd:
+            converted_path = copies.get(dest_path, dest_path)
+            success, original_rate, output_rate = futures[converted_path].result()
+            if success and converted_path != dest_path:
+                success = _link_or_copy_file(converted_path, dest_path)
             if success:
                 conversion_stats.total_samples += 1
                 if original_rate != output_rate:
@@ -2230,8 +2552,6 @@ def write_elmulti(
             zd["output_rate"] = target_rate if target_rate else zd["original_rate"]
             conversion_stats.total_samples += 1
 
-        zd["new_filename"] = new_filename
-
     # Normalize samples if requested (must happen BEFORE loop processing)
     if normalize_db is not None:
         print(f"\nNormalizing samples to {normalize_db} dB...")
@@ -2249,238 +2569,265 @@ def write_elmulti(
     elmulti_path = os.path.join(output_dir, f"{safe_name}.elmulti")
     print(f"\nGenerating: {safe_name}.elmulti")
 
-    # Group zones by (pitch, minvel)
-    zones_by_key = defaultdict(list)
-    for zd in zone_data:
-        key = (zd["pitch"], zd["minvel"])
-        zones_by_key[key].append(zd)
-
-    sorted_keys = sorted(zones_by_key.keys())
+    # Group zones by (pitch, minvel). The stable sort keeps zone order within
+    # each key and is a single linear pass on the parsers' already-sorted
+    # output, so groupby() can stream the groups without an auxiliary dict.
+    layer_key = itemgetter("pitch", "minvel")
+    grouped_zones = groupby(sorted(zone_data, key=layer_key), key=layer_key)
     written_pitches = set()
-
-    with open(elmulti_path, "w", newline="\n") as f:
-        f.write("# ELEKTRON MULTI-SAMPLE MAPPING FORMAT\n")
-        f.write("version = 0\n")
-        f.write(f"name = '{prefixed_name}'\n")
-
-        for pitch, minvel in sorted_keys:
-            zones_in_key = zones_by_key[(pitch, minvel)]
-
-            # Write key-zone header once per pitch
-            if pitch not in written_pitches:
-                # Get key_center from the first zone at this pitch
-                key_center = zones_in_key[0].get("key_center", pitch)
-                f.write("\n[[key-zones]]\n")
-                f.write(f"pitch = {pitch}\n")
-                f.write(f"key-center = {float(key_center)}\n")
-                written_pitches.add(pitch)
-
-            # Velocity layer
-            velocity = minvel / 127.0
-            f.write("\n[[key-zones.velocity-layers]]\n")
-            f.write(f"velocity = {velocity}\n")
-            f.write("strategy = 'Forward'\n")
-
-            # Sample slots (multiple for round-robin)
-            for zd in zones_in_key:
-                resample_ratio = zd.get("resample_ratio", 1.0)
-                output_rate = zd.get("output_rate", 48000)
-
-                f.write("\n[[key-zones.velocity-layers.sample-slots]]\n")
-                f.write(f"sample = '{zd['new_filename']}'\n")
-
-                # Trim points (only if > 0)
-                # Use int() by default, round() with --round-loop-points option
-                convert_func = round if round_loop_points else int
-                trim_start = zd.get("trim_start", 0)
-                trim_end = zd.get("trim_end", 0)
-
-                # Get actual sample count for validation
-                wav_path = os.path.join(output_dir, zd["new_filename"])
-                actual_sample_count = get_sample_count(wav_path)
-
-                if trim_start > 0:
-                    f.write(
-                        f"trim-start = {convert_func(trim_start * resample_ratio)}\n"
-                    )
-                if trim_end > 0:
-                    # Validate trim-end: omit if out of bounds (file uses full length)
-                    scaled_trim_end = convert_func(trim_end * resample_ratio)
-                    validated_trim_end, trim_warning = validate_sample_position(
-                        scaled_trim_end, actual_sample_count, can_omit=True
+    num_vel_layers = 0
+
+    # Use int() by default, round() with --round-loop-points option
+    convert_func = round if round_loop_points else int
+
+    # Build the file in memory and write it in one call at the end, so a
+    # failure part-way through never leaves a truncated .elmulti behind
+    lines = []
+    write = lines.append
+
+    write("# ELEKTRON MULTI-SAMPLE MAPPING FORMAT\n")
+    write("version = 0\n")
+    write(f"name = '{prefixed_name}'\n")
+
+    for (pitch, minvel), group in grouped_zones:
+        zones_in_key = list(group)
+        num_vel_layers += 1
+
+        # Write key-zone header once per pitch
+        if pitch not in written_pitches:
+            # Get key_center from the first zone at this pitch
+            key_center = zones_in_key[0].get("key_center", pitch)
+            write("\n[[key-zones]]\n")
+            write(f"pitch = {pitch}\n")
+            write(f"key-center = {float(key_center)}\n")
+            written_pitches.add(pitch)
+
+        # Velocity layer
+        velocity = minvel / 127.0
+        write("\n[[key-zones.velocity-layers]]\n")
+        write(f"velocity = {velocity}\n")
+        write("strategy = 'Forward'\n")
+
+        # Sample slots (multiple for round-robin)
+        for zd in zones_in_key:
+            resample_ratio = zd.get("resample_ratio", 1.0)
+            output_rate = zd.get("output_rate", 48000)
+            new_filename = zd["new_filename"]
+            wav_path = os.path.join(output_dir, new_filename)
+            key_center = zd.get("key_center", pitch)
+
+            write("\n[[key-zones.velocity-layers.sample-slots]]\n")
+            write(f"sample = '{new_filename}'\n")
+
+            # Trim points (only if > 0)
+            trim_start = zd.get("trim_start", 0)
+            trim_end = zd.get("trim_end", 0)
+
+            # Get actual sample count for validation
+            actual_sample_count = get_sample_count(wav_path)
+
+            if trim_start > 0:
+                write(f"trim-start = {convert_func(trim_start * resample_ratio)}\n")
+            if trim_end > 0:
+                # Validate trim-end: omit if out of bounds (file uses full length)
+                scaled_trim_end = convert_func(trim_end * resample_ratio)
+                validated_trim_end, trim_warning = validate_sample_position(
+                    scaled_trim_end, actual_sample_count, can_omit=True
+                )
+                if trim_warning:
+                    print(f"    trim-end {trim_warning}")
+                    conversion_stats.add_warning(
+                        new_filename, f"trim-end {trim_warning}"
                     )
-                    if trim_warning:
-                        print(f"    trim-end {trim_warning}")
-                        conversion_stats.add_warning(
-                            zd["new_filename"], f"trim-end {trim_warning}"
-                        )
-                    if validated_trim_end > 0:
-                        f.write(f"trim-end = {validated_trim_end}\n")
+                if validated_trim_end > 0:
+                    write(f"trim-end = {validated_trim_end}\n")
 
-                if zd["loop"]:
-                    f.write("loop-mode = 'Forward'\n")
-                    conversion_stats.loops_with_loop += 1
+            if zd["loop"]:
+                write("loop-mode = 'Forward'\n")
+                conversion_stats.loops_with_loop += 1
 
-                    # Calculate approximate loop length to determine processing mode
-                    # Note: loop_end is INCLUSIVE, so length = end - start + 1
-                    approx_loop_length = round(
-                        (zd["loop_end"] - zd["loop_start"] + 1) * resample_ratio
-                    )
+                # Source loop points (before resampling)
+                orig_loop_start = zd["loop_start"]
+                orig_loop_end = zd["loop_end"]
 
-                    # Check if this is a single-cycle waveform
-                    is_sc = (
-                        single_cycle_threshold > 0
-                        and resample_ratio != 1.0
-                        and is_single_cycle(approx_loop_length, single_cycle_threshold)
-                    )
+                # Calculate approximate loop length to determine processing mode
+                # Note: loop_end is INCLUSIVE, so length = end - start + 1
+                approx_loop_length = round(
+                    (orig_loop_end - orig_loop_start + 1) * resample_ratio
+                )
+
+                # Check if this is a single-cycle waveform
+                is_sc = (
+                    single_cycle_threshold > 0
+                    and resample_ratio != 1.0
+                    and is_single_cycle(approx_loop_length, single_cycle_threshold)
+                )
 
-                    if is_sc:
-                        # Single-cycle: use strict ratio calculation (pitch priority)
-                        conversion_stats.loops_single_cycle += 1
-                        wav_path = os.path.join(output_dir, zd["new_filename"])
-                        samples = None
+                if is_sc:
+                    # Single-cycle: use strict ratio calculation (pitch priority)
+                    conversion_stats.loops_single_cycle += 1
+                    samples = None
+                    try:
+                        samples = read_wav_samples(wav_path)
+                    except Exception:
+                        pass
+
+                    loop_start, loop_end, warning = calculate_single_cycle_loop(
+                        orig_loop_start,
+                        orig_loop_end,
+                        resample_ratio,
+                        samples,
+                    )
+                    print(
+                        f"    Single-cycle detected: loop_len={approx_loop_length}, "
+                        f"using strict ratio"
+                    )
+                    if warning:
+                        print(f"    {warning}")
+                        conversion_stats.add_warning(
+                            new_filename, "single-cycle warning"
+                        )
+                else:
+                    # Normal loop: use standard calculation
+                    conversion_stats.loops_normal += 1
+                    loop_start = convert_func(orig_loop_start * resample_ratio)
+                    loop_end = convert_func(orig_loop_end * resample_ratio)
+
+                    # Optimize loop points if requested (for normal loops only)
+                    # Goal: minimize amplitude discontinuity (clicks) at loop boundary
+                    if optimize_loops and resample_ratio != 1.0:
                         try:
                             samples = read_wav_samples(wav_path)
-                        except Exception:
-                            pass
-
-                        loop_start, loop_end, warning = calculate_single_cycle_loop(
-                            zd["loop_start"],
-                            zd["loop_end"],
-                            resample_ratio,
-                            samples,
-                        )
-                        print(
-                            f"    Single-cycle detected: loop_len={approx_loop_length}, "
-                            f"using strict ratio"
-                        )
-                        if warning:
-                            print(f"    {warning}")
-                            conversion_stats.add_warning(
-                                zd["new_filename"], "single-cycle warning"
-                            )
-                    else:
-                        # Normal loop: use standard calculation
-                        conversion_stats.loops_normal += 1
-                        loop_start = convert_func(zd["loop_start"] * resample_ratio)
-                        loop_end = convert_func(zd["loop_end"] * resample_ratio)
-
-                        # Optimize loop points if requested (for normal loops only)
-                        # Goal: minimize amplitude discontinuity (clicks) at loop boundary
-                        if optimize_loops and resample_ratio != 1.0:
-                            wav_path = os.path.join(output_dir, zd["new_filename"])
-                            try:
-                                samples = read_wav_samples(wav_path)
-                                total_samples = len(samples) if samples else 0
-                                # Validate both loop_start and loop_end bounds
-                                if (
-                                    samples
-                                    and 0 <= loop_start < total_samples
-                                    and 0 <= loop_end < total_samples
-                                ):
-                                    # Amplitude discontinuity at loop boundary
-                                    # Playback: ... → samples[loop_end] → samples[loop_start] → ...
-                                    orig_diff = abs(
-                                        samples[loop_end] - samples[loop_start]
-                                    )
-                                    opt_start, opt_end, opt_diff = optimize_loop_points(
-                                        samples,
-                                        loop_start,
-                                        loop_end,
-                                        loop_search_range,
+                            total_samples = len(samples) if samples else 0
+                            # Validate both loop_start and loop_end bounds
+                            if (
+                                samples
+                                and 0 <= loop_start < total_samples
+                                and 0 <= loop_end < total_samples
+                            ):
+                                # Amplitude discontinuity at loop boundary
+                                # Playback: ... → samples[loop_end] → samples[loop_start] → ...
+                                orig_diff = abs(samples[loop_end] - samples[loop_start])
+                                # Optional loop-length quantisation: keep the
+                                # loop a whole multiple of N samples (for
+                                # devices/workflows that expect quantised loop
+                                # lengths). The aligned end is chosen by the
+                                # same click-minimising search, but the best
+                                # aligned point can still be worse than the
+                                # original one; alignment is applied anyway
+                                # and reported as forced.
+                                # Loops shorter than N are left unaligned.
+                                align = (
+                                    loop_len_align
+                                    if loop_end - loop_start + 1 >= loop_len_align
+                                    else 0
+                                )
+                                opt_start, opt_end, opt_diff = optimize_loop_points(
+                                    samples,
+                                    loop_start,
+                                    loop_end,
+                                    loop_search_range,
+                                    length_align=align,
+                                )
+                                if opt_diff < orig_diff:
+                                    print(
+                                        f"    Loop optimized: ({loop_start}, {loop_end}) -> "
+                                        f"({opt_start}, {opt_end}), diff: {orig_diff:,} -> {opt_diff:,}"
                                     )
-                                    if opt_diff < orig_diff:
+                                    if align:
                                         print(
-                                            f"    Loop optimized: ({loop_start}, {loop_end}) -> "
-                                            f"({opt_start}, {opt_end}), diff: {orig_diff:,} -> {opt_diff:,}"
+                                            f"    Loop length aligned to {align}: "
+                                            f"{opt_end - opt_start + 1} samples"
                                         )
-                                        loop_start = opt_start
-                                        loop_end = opt_end
-                                        conversion_stats.loops_optimized += 1
-
-                                # Clamp loop points to valid range (safety)
-                                if loop_start < 0 or loop_start >= total_samples:
-                                    clamped = max(0, min(loop_start, total_samples - 1))
-                                    print(
-                                        f"    Warning: loop_start clamped: {loop_start} -> {clamped}"
-                                    )
-                                    conversion_stats.add_warning(
-                                        zd["new_filename"], "loop_start clamped"
-                                    )
-                                    loop_start = clamped
-                                if loop_end < loop_start:
-                                    print(
-                                        f"    Warning: loop_end clamped: {loop_end} -> {loop_start}"
-                                    )
-                                    conversion_stats.add_warning(
-                                        zd["new_filename"], "loop_end clamped"
-                                    )
-                                    loop_end = loop_start
-                                if loop_end >= total_samples:
-                                    clamped = total_samples - 1
+                                    loop_start = opt_start
+                                    loop_end = opt_end
+                                    conversion_stats.loops_optimized += 1
+                                elif align and (opt_start, opt_end) != (
+                                    loop_start,
+                                    loop_end,
+                                ):
                                     print(
-                                        f"    Warning: loop_end clamped: {loop_end} -> {clamped}"
-                                    )
-                                    conversion_stats.add_warning(
-                                        zd["new_filename"], "loop_end clamped"
+                                        f"    Loop length aligned to {align} (forced): "
+                                        f"({loop_start}, {loop_end}) -> ({opt_start}, {opt_end}), "
+                                        f"diff: {orig_diff:,} -> {opt_diff:,}"
                                     )
-                                    loop_end = clamped
-                            except Exception as e:
-                                print(f"    Warning: Loop optimization failed: {e}")
+                                    loop_start = opt_start
+                                    loop_end = opt_end
+
+                            # Clamp loop points to valid range (safety)
+                            if loop_start < 0 or loop_start >= total_samples:
+                                clamped = max(0, min(loop_start, total_samples - 1))
+                                print(
+                                    f"    Warning: loop_start clamped: {loop_start} -> {clamped}"
+                                )
                                 conversion_stats.add_warning(
-                                    zd["new_filename"], "loop optimization failed"
+                                    new_filename, "loop_start clamped"
                                 )
+                                loop_start = clamped
+                            if loop_end < loop_start:
+                                print(
+                                    f"    Warning: loop_end clamped: {loop_end} -> {loop_start}"
+                                )
+                                conversion_stats.add_warning(
+                                    new_filename, "loop_end clamped"
+                                )
+                                loop_end = loop_start
+                            if loop_end >= total_samples:
+                                clamped = total_samples - 1
+                                print(
+                                    f"    Warning: loop_end clamped: {loop_end} -> {clamped}"
+                                )
+                                conversion_stats.add_warning(
+                                    new_filename, "loop_end clamped"
+                                )
+                                loop_end = clamped
+                        except Exception as e:
+                            print(f"    Warning: Loop optimization failed: {e}")
+                            conversion_stats.add_warning(
+                                new_filename, "loop optimization failed"
+                            )
 
-                    # Validate loop-end: clamp if out of bounds (required field, cannot omit)
-                    validated_loop_end, loop_end_warning = validate_sample_position(
-                        loop_end, actual_sample_count, can_omit=False
+                # Validate loop-end: clamp if out of bounds (required field, cannot omit)
+                validated_loop_end, loop_end_warning = validate_sample_position(
+                    loop_end, actual_sample_count, can_omit=False
+                )
+                if loop_end_warning:
+                    print(f"    loop-end {loop_end_warning}")
+                    conversion_stats.add_warning(
+                        new_filename, f"loop-end {loop_end_warning}"
                     )
-                    if loop_end_warning:
-                        print(f"    loop-end {loop_end_warning}")
-                        conversion_stats.add_warning(
-                            zd["new_filename"], f"loop-end {loop_end_warning}"
-                        )
-                        loop_end = validated_loop_end
+                    loop_end = validated_loop_end
 
-                    f.write(f"loop-start = {loop_start}\n")
-                    f.write(f"loop-end = {loop_end}\n")
+                write(f"loop-start = {loop_start}\n")
+                write(f"loop-end = {loop_end}\n")
 
-                    # Embed smpl chunk into WAV file
-                    if embed_loop:
-                        wav_path = os.path.join(output_dir, zd["new_filename"])
-                        key_center = zd.get("key_center", pitch)
-                        if embed_smpl_chunk(wav_path, loop_start, loop_end, key_center):
-                            print(f"    Embedded smpl chunk: {zd['new_filename']}")
+                # Embed smpl chunk into WAV file
+                if embed_loop:
+                    if embed_smpl_chunk(wav_path, loop_start, loop_end, key_center):
+                        print(f"    Embedded smpl chunk: {new_filename}")
 
-                    if zd["loop_crossfade_ms"] > 0:
-                        crossfade_samples = zd["loop_crossfade_ms"] * (
-                            output_rate // 1000
-                        )
-                        f.write(f"loop-crossfade = {crossfade_samples}\n")
+                if zd["loop_crossfade_ms"] > 0:
+                    crossfade_samples = zd["loop_crossfade_ms"] * (output_rate // 1000)
+                    write(f"loop-crossfade = {crossfade_samples}\n")
 
-                    if zd["keep_looping_on_release"]:
-                        f.write("keep-looping-on-release = true\n")
-                else:
-                    f.write("loop-mode = 'Off'\n")
-                    conversion_stats.loops_without_loop += 1
-
-                    # Embed smpl chunk with root note info (no loop)
-                    if embed_loop:
-                        wav_path = os.path.join(output_dir, zd["new_filename"])
-                        key_center = zd.get("key_center", pitch)
-                        if embed_smpl_chunk(wav_path, None, None, key_center):
-                            print(
-                                f"    Embedded smpl chunk (root note): {zd['new_filename']}"
-                            )
+                if zd["keep_looping_on_release"]:
+                    write("keep-looping-on-release = true\n")
+            else:
+                write("loop-mode = 'Off'\n")
+                conversion_stats.loops_without_loop += 1
+
+                # Embed smpl chunk with root note info (no loop)
+                if embed_loop:
+                    if embed_smpl_chunk(wav_path, None, None, key_center):
+                        print(f"    Embedded smpl chunk (root note): {new_filename}")
+
+    with open(elmulti_path, "w", newline="\n") as f:
+        f.write("".join(lines))
 
     # Increment files processed count
     conversion_stats.files_processed += 1
 
-    # Calculate statistics
-    vel_layers_by_pitch = defaultdict(set)
-    for zd in zone_data:
-        vel_layers_by_pitch[zd["pitch"]].add(zd["minvel"])
-    num_vel_layers = sum(len(v) for v in vel_layers_by_pitch.values())
+    # Calculate statistics (num_vel_layers counts (pitch, minvel) keys)
     num_rr = sum(1 for zd in zone_data if zd["rr_position"] >= 0)
 
     return {
@@ -2508,6 +2855,7 @@ def convert_to_elmulti(
     thin_factor=None,
     thin_anchor=0,
     thin_max_interval=None,
+    loop_len_align=0,
 ):
     """Convert input file to elmulti format.
 
@@ -2526,7 +2874,13 @@ def convert_to_elmulti(
         thin_factor: Thinning factor N (keep 1 of every N, None = disabled)
         thin_anchor: Anchor note for thinning (0-11, default: 0 = C)
         thin_max_interval: Maximum interval limit for thinning (optional)
+        loop_len_align: Constrain optimized loop length to a multiple of N
+            samples, choosing the aligned end with the lowest click (0 to disable)
     """
+    # Probe results only need to live for one instrument; dropping them here
+    # keeps long GUI sessions from accumulating entries for every library
+    _audio_info_cache.clear()
+
     ext = os.path.splitext(input_path)[1].lower()
 
     if ext == ".exs":
@@ -2584,6 +2938,7 @@ def convert_to_elmulti(
         embed_loop,
         prefix,
         normalize_db,
+        loop_len_align,
     )
 
     # Print summary
@@ -2663,6 +3018,13 @@ def main():
         metavar="N",
         help="Number of samples to search in each direction for loop optimization (default: 5)",
     )
+    parser.add_argument(
+        "--loop-len-align",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Keep optimized loop length a multiple of N samples, picking the aligned end with the smallest click; requires -O (default: 0 = disabled)",
+    )
     parser.add_argument(
         "--single-cycle-threshold",
         type=int,
@@ -2762,8 +3124,9 @@ def main():
                 f"OUTPUT_DIR is a file, not a directory: {args.output_dir}"
             )
 
-        # Sort files for consistent ordering
-        input_files.sort()
+        # Sort files for consistent ordering, converting each file once even
+        # if several patterns matched it
+        input_files = sorted(set(input_files))
 
         # Determine single-cycle threshold (0 if disabled)
         sc_threshold = 0 if args.no_single_cycle else args.single_cycle_threshold
@@ -2771,6 +3134,11 @@ def main():
         # Determine resample rate (None if disabled)
         resample_rate = None if args.no_resample else args.resample_rate
 
+        if args.loop_len_align < 0:
+            raise ValidationError("--loop-len-align value must be >= 0")
+        if args.loop_len_align > 0 and not args.optimize_loop:
+            raise ValidationError("--loop-len-align requires --optimize-loop (-O)")
+
         # Validate and parse thinning options
         thin_anchor = 0
         if args.thin_preview and not args.thin:
@@ -2832,6 +3200,7 @@ def main():
                 args.thin,
                 thin_anchor,
                 args.thin_max_interval,
+                args.loop_len_align,
             )
             if len(input_files) > 1:
                 print()
@@ -2844,6 +3213,7 @@ def main():
             "round_loop": args.round_loop,
             "optimize_loops": args.optimize_loop,
             "loop_search_range": args.loop_search_range,
+            "loop_len_align": args.loop_len_align,
             "single_cycle_threshold": sc_threshold,
             "embed_loop": not args.no_embed_loop,
         }
@@ -1,5 +1,9 @@
 """Main Flet application."""
 
+import asyncio
+import os
+from pathlib import Path
+
 import flet as ft
 
 from elmconv import __version__ as elmconv_version
@@ -32,9 +36,10 @@ class ElmconvApp:
 
         # Build layout
         self._build_layout()
+        self.log_view.attached = True
 
         # Initial state
-        self._check_ffmpeg()
+        self.page.run_task(self._check_ffmpeg)
         self.log_view.add(Strings.READY_MESSAGE, "info")
         self.log_view.add(
             f"elmconv v{elmconv_version} (Flet {ft.version.__version__})", "info"
@@ -46,11 +51,20 @@ class ElmconvApp:
         self.page.window.width = 550
         self.page.window.height = 840
         self.page.padding = 20
+        # Gap between panels (previously a 10px spacer plus default spacing)
+        self.page.spacing = 30
 
     def _setup_services(self):
         """Register page services."""
-        self.file_picker = ft.FilePicker()
-        self.page.services.append(self.file_picker)
+        # Reuse a picker already registered on this page
+        self.file_picker = next(
+            (s for s in self.page.services if isinstance(s, ft.FilePicker)), None
+        )
+        if self.file_picker is None:
+            self.file_picker = ft.FilePicker()
+            self.page.services.append(self.file_picker)
+        # Only one file dialog may be open at a time
+        self.picker_lock = asyncio.Lock()
 
     def _create_components(self):
         """Create all GUI components."""
@@ -67,6 +81,7 @@ class ElmconvApp:
         self.output_picker = OutputPicker(
             page=self.page,
             file_picker=self.file_picker,
+            picker_lock=self.picker_lock,
             on_selected=self._on_output_selected,
             log_callback=self._gui_log,
         )
@@ -78,6 +93,7 @@ class ElmconvApp:
         self.input_selector = InputSelector(
             page=self.page,
             file_picker=self.file_picker,
+            picker_lock=self.picker_lock,
             on_files_selected=self._on_input_selected,
             log_callback=self._gui_log,
         )
@@ -90,13 +106,9 @@ class ElmconvApp:
                 size=20,
                 weight=ft.FontWeight.BOLD,
             ),
-            ft.Container(height=10),
             self.output_picker.container,
-            ft.Container(height=10),
             self.options_panel.container,
-            ft.Container(height=10),
             self.input_selector.container,
-            ft.Container(height=10),
             self.log_view.container,
         )
 
@@ -104,9 +116,9 @@ class ElmconvApp:
         """Log callback for GUI."""
         self.log_view.add(message, level)
 
-    def _check_ffmpeg(self):
-        """Check ffmpeg availability at startup."""
-        available, error = self.converter.check_ffmpeg()
+    async def _check_ffmpeg(self):
+        """Check ffmpeg availability at startup (off the UI thread)."""
+        available, error = await asyncio.to_thread(self.converter.check_ffmpeg)
         if not available:
             self.log_view.add(error, "error")
 
@@ -124,17 +136,25 @@ class ElmconvApp:
         # Get options
         options = self.options_panel.get_options()
 
-        self._gui_log(
-            Strings.STARTING_CONVERSION.format(count=len(paths)),
-            "info",
-        )
-
         # Disable input during conversion
         self.input_selector.set_enabled(False)
 
         try:
+            # Skip bad entries up front; progress and the result line both
+            # count only the files that are actually converted
+            paths = await self._validate_inputs(paths)
+            total = len(paths)
+            if not paths:
+                self._gui_log(Strings.NOTHING_TO_CONVERT, "warning")
+                return
+
+            self._gui_log(
+                Strings.STARTING_CONVERSION.format(count=total),
+                "info",
+            )
+
             # Run conversion
-            success, total = await self.converter.convert_files(
+            success, _ = await self.converter.convert_files(
                 input_paths=paths,
                 output_dir=self._output_path,
                 resample=options.resample,
@@ -157,6 +177,39 @@ class ElmconvApp:
             # Re-enable input
             self.input_selector.set_enabled(True)
 
+    async def _validate_inputs(self, paths: list[str]) -> list[str]:
+        """Drop missing or empty input files before conversion.
+
+        All files are stat'ed concurrently, so a bad entry costs one stat
+        instead of a failed conversion attempt.
+
+        Returns:
+            list[str]: Paths that look convertible, in the original order
+        """
+
+        async def probe(path: str) -> int | OSError:
+            try:
+                return await asyncio.to_thread(os.path.getsize, path)
+            except OSError as e:
+                return e
+
+        sizes = await asyncio.gather(*(probe(path) for path in paths))
+
+        valid = []
+        for path, size in zip(paths, sizes):
+            if isinstance(size, OSError):
+                reason = size.strerror or str(size)
+            elif size == 0:
+                reason = Strings.INPUT_EMPTY
+            else:
+                valid.append(path)
+                continue
+            self._gui_log(
+                Strings.INPUT_SKIPPED.format(filename=Path(path).name, reason=reason),
+                "warning",
+            )
+        return valid
+
     async def _show_completion_dialog(self, success: int, total: int):
         """Show completion dialog."""
         dialog = ft.AlertDialog(
@@ -1,11 +1,64 @@
 """Input file/folder selection component."""
 
+import asyncio
+import os
+import re
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 import flet as ft
 
+from elmconv import sanitize_filename
+
 from ..strings import Strings
+from .styles import PANEL_BORDER, PANEL_BORDER_RADIUS, section_header
+
+# Instrument files picked up when scanning a folder
+_INSTRUMENT_FILE_PATTERN = re.compile(r"\.(?:exs|sfz)$", re.IGNORECASE)
+
+
+def _iter_instrument_files(folder: str) -> Iterator[str]:
+    """Yield instrument files in a folder and its subfolders.
+
+    Folders are walked top-down in name order; hidden folders are skipped.
+
+    Args:
+        folder: Root folder to scan
+
+    Yields:
+        str: Path of each .exs/.sfz file
+    """
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if _INSTRUMENT_FILE_PATTERN.search(name):
+                yield os.path.join(dirpath, name)
+
+
+def _split_duplicate_names(paths: list[str]) -> tuple[list[str], list[str]]:
+    """Separate files whose output folder would clash with an earlier file.
+
+    Each instrument is written to output_dir/<sanitized file name>, so two
+    files with the same name in different subfolders would overwrite each
+    other. Names are compared case-insensitively to match the default
+    file systems on macOS and Windows.
+
+    Args:
+        paths: Instrument files in scan order
+
+    Returns:
+        tuple: (paths to convert, later duplicates to skip)
+    """
+    seen = set()
+    unique, duplicates = [], []
+    for path in paths:
+        key = sanitize_filename(Path(path).stem).casefold()
+        if key in seen:
+            duplicates.append(path)
+        else:
+            seen.add(key)
+            unique.append(path)
+    return unique, duplicates
 
 
 class InputSelector:
@@ -15,6 +68,7 @@ class InputSelector:
         self,
         page: ft.Page,
         file_picker: ft.FilePicker,
+        picker_lock: asyncio.Lock,
         on_files_selected: Callable[[list[str]], None],
         log_callback: Callable[[str, str], None],
     ):
@@ -23,11 +77,13 @@ class InputSelector:
         Args:
             page: Flet page instance
             file_picker: FilePicker service
+            picker_lock: Lock shared by all users of file_picker
             on_files_selected: Callback when files are selected
             log_callback: Callback for logging (message, level)
         """
         self.page = page
         self.file_picker = file_picker
+        self.picker_lock = picker_lock
         self.on_files_selected = on_files_selected
         self.log = log_callback
 
@@ -58,11 +114,7 @@ class InputSelector:
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text(
-                        Strings.SELECT_INPUT,
-                        weight=ft.FontWeight.BOLD,
-                        size=12,
-                    ),
+                    section_header(Strings.SELECT_INPUT),
                     ft.Row(
                         [self.select_files_btn, self.select_folder_btn],
                         spacing=10,
@@ -78,8 +130,8 @@ class InputSelector:
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             ),
             padding=15,
-            border=ft.Border.all(1, ft.Colors.GREY_300),
-            border_radius=8,
+            border=PANEL_BORDER,
+            border_radius=PANEL_BORDER_RADIUS,
         )
 
     def set_enabled(self, enabled: bool):
@@ -90,13 +142,17 @@ class InputSelector:
 
     async def _on_select_files(self, e):
         """Handle file selection."""
-        results = await self.file_picker.pick_files(
-            dialog_title=Strings.SELECT_FILES_TITLE,
-            file_type=ft.FilePickerFileType.CUSTOM,
-            allowed_extensions=["exs", "sfz"],
-            allow_multiple=True,
-            initial_directory=self._last_directory,
-        )
+        # Ignore clicks while another dialog is open
+        if self.picker_lock.locked():
+            return
+        async with self.picker_lock:
+            results = await self.file_picker.pick_files(
+                dialog_title=Strings.SELECT_FILES_TITLE,
+                file_type=ft.FilePickerFileType.CUSTOM,
+                allowed_extensions=["exs", "sfz"],
+                allow_multiple=True,
+                initial_directory=self._last_directory,
+            )
         if results:
             paths = [f.path for f in results]
             # Remember directory for next time
@@ -105,22 +161,35 @@ class InputSelector:
 
     async def _on_select_folder(self, e):
         """Handle folder selection."""
-        result = await self.file_picker.get_directory_path(
-            dialog_title=Strings.SELECT_INPUT_FOLDER_TITLE,
-            initial_directory=self._last_directory,
-        )
+        # Ignore clicks while another dialog is open
+        if self.picker_lock.locked():
+            return
+        async with self.picker_lock:
+            result = await self.file_picker.get_directory_path(
+                dialog_title=Strings.SELECT_INPUT_FOLDER_TITLE,
+                initial_directory=self._last_directory,
+            )
         if result:
             folder = Path(result)
             # Remember directory for next time
             self._last_directory = str(folder)
-            files = list(folder.glob("*.exs")) + list(folder.glob("*.sfz"))
+            paths = await asyncio.to_thread(
+                lambda: list(_iter_instrument_files(str(folder)))
+            )
 
-            if files:
-                paths = [str(f) for f in sorted(files)]
+            if paths:
                 self.log(
                     f"Found {len(paths)} file(s) in {folder.name}/",
                     "info",
                 )
+                paths, duplicates = _split_duplicate_names(paths)
+                for path in duplicates:
+                    self.log(
+                        Strings.DUPLICATE_NAME_SKIPPED.format(
+                            path=os.path.relpath(path, folder)
+                        ),
+                        "warning",
+                    )
                 await self.on_files_selected(paths)
             else:
                 self.log(
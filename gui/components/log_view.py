@@ -1,15 +1,35 @@
 """Conversion log display component."""
 
+import asyncio
+from collections import deque
 from typing import Callable
 
 import flet as ft
 
 from ..strings import Strings
+from .styles import PANEL_BORDER, section_header
+
+# Delay before pushing new log entries to the client, so a burst of
+# entries is sent in one update instead of one update per line
+FLUSH_DELAY_SECONDS = 0.05
+
+# Maximum number of lines kept on screen; older lines are dropped so each
+# update stays cheap during long batches. Copy keeps a longer history.
+MAX_DISPLAY_LINES = 2000
+MAX_HISTORY_LINES = MAX_DISPLAY_LINES * 4
 
 
 class LogView:
     """Log view with copy and clear functionality."""
 
+    # Text color per log level (None = default)
+    COLOR_MAP = {
+        "info": None,
+        "warning": ft.Colors.ORANGE,
+        "error": ft.Colors.RED,
+        "success": ft.Colors.GREEN,
+    }
+
     def __init__(
         self,
         page: ft.Page,
@@ -22,8 +42,12 @@ class LogView:
             get_debug_log: Callback to get detailed debug log
         """
         self.page = page
-        self._log_entries: list[str] = []
+        self._log_entries: deque[str] = deque(maxlen=MAX_HISTORY_LINES)
+        self._text_cache: str | None = None
         self._get_debug_log = get_debug_log
+        self._flush_pending = False
+        # Set by the app once the log is part of the page layout
+        self.attached = False
 
         # Create ListView for log entries
         self.log_list = ft.ListView(
@@ -42,11 +66,7 @@ class LogView:
                 [
                     ft.Row(
                         [
-                            ft.Text(
-                                Strings.CONVERSION_LOG,
-                                weight=ft.FontWeight.BOLD,
-                                size=12,
-                            ),
+                            section_header(Strings.CONVERSION_LOG),
                             ft.Row(
                                 [
                                     ft.TextButton(
@@ -69,7 +89,7 @@ class LogView:
                     ),
                     ft.Container(
                         content=self.log_list,
-                        border=ft.Border.all(1, ft.Colors.GREY_300),
+                        border=PANEL_BORDER,
                         border_radius=5,
                         padding=10,
                         expand=True,
@@ -88,29 +108,37 @@ class LogView:
             message: Log message
             level: "info", "warning", "error", or "success"
         """
-        color_map = {
-            "info": None,
-            "warning": ft.Colors.ORANGE,
-            "error": ft.Colors.RED,
-            "success": ft.Colors.GREEN,
-        }
-        color = color_map.get(level)
+        color = self.COLOR_MAP.get(level)
 
         text = ft.Text(message, color=color, size=12)
-        self.log_list.controls.append(text)
+        controls = self.log_list.controls
+        controls.append(text)
+        if len(controls) > MAX_DISPLAY_LINES:
+            del controls[: len(controls) - MAX_DISPLAY_LINES]
         self._log_entries.append(message)
-        if self.page.controls:
-            self.page.update()
+        self._text_cache = None
+        if self.attached and not self._flush_pending:
+            self._flush_pending = True
+            self.page.run_task(self._flush)
+
+    async def _flush(self):
+        """Push pending log entries to the client in a single update."""
+        await asyncio.sleep(FLUSH_DELAY_SECONDS)
+        self._flush_pending = False
+        self.page.update()
 
     def clear(self):
         """Clear all log entries."""
         self.log_list.controls.clear()
         self._log_entries.clear()
+        self._text_cache = None
         self.page.update()
 
     def get_text(self) -> str:
         """Get all log text as single string."""
-        return "\n".join(self._log_entries)
+        if self._text_cache is None:
+            self._text_cache = "\n".join(self._log_entries)
+        return self._text_cache
 
     async def _on_copy_click(self, e):
         """Handle copy button click."""
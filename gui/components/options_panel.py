@@ -5,11 +5,12 @@ from dataclasses import dataclass
 import flet as ft
 
 from ..strings import Strings
+from .styles import PANEL_BORDER, PANEL_BORDER_RADIUS, section_header
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversionOptions:
-    """Conversion options data class."""
+    """Conversion options data class (immutable snapshot of the panel)."""
 
     resample: bool = True
     optimize: bool = False
@@ -114,11 +115,7 @@ class OptionsPanel:
                     # Header row with title and help button
                     ft.Row(
                         [
-                            ft.Text(
-                                Strings.OPTIONS,
-                                weight=ft.FontWeight.BOLD,
-                                size=12,
-                            ),
+                            section_header(Strings.OPTIONS),
                             self.options_help_btn,
                         ],
                         alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
@@ -142,8 +139,8 @@ class OptionsPanel:
                 spacing=8,
             ),
             padding=10,
-            border=ft.Border.all(1, ft.Colors.GREY_300),
-            border_radius=8,
+            border=PANEL_BORDER,
+            border_radius=PANEL_BORDER_RADIUS,
         )
 
     def get_options(self) -> ConversionOptions:
@@ -1,11 +1,13 @@
 """Output folder selection component."""
 
-from pathlib import Path
+import asyncio
+import os
 from typing import Callable
 
 import flet as ft
 
 from ..strings import Strings
+from .styles import PANEL_BORDER, PANEL_BORDER_RADIUS, section_header
 
 
 class OutputPicker:
@@ -15,6 +17,7 @@ class OutputPicker:
         self,
         page: ft.Page,
         file_picker: ft.FilePicker,
+        picker_lock: asyncio.Lock,
         on_selected: Callable[[str], None],
         log_callback: Callable[[str, str], None],
     ):
@@ -23,15 +26,20 @@ class OutputPicker:
         Args:
             page: Flet page instance
             file_picker: FilePicker service
+            picker_lock: Lock shared by all users of file_picker
             on_selected: Callback when folder is selected
             log_callback: Callback for logging (message, level)
         """
         self.page = page
         self.file_picker = file_picker
+        self.picker_lock = picker_lock
         self.on_selected = on_selected
         self.log = log_callback
         self.selected_path: str | None = None
 
+        # Emptiness check results: {folder: (folder mtime, is empty)}
+        self._empty_cache: dict[str, tuple[float, bool]] = {}
+
         # Path text field
         self.path_field = ft.TextField(
             label=Strings.OUTPUT_FOLDER,
@@ -48,11 +56,7 @@ class OutputPicker:
         return ft.Container(
             content=ft.Column(
                 [
-                    ft.Text(
-                        Strings.OUTPUT_FOLDER,
-                        weight=ft.FontWeight.BOLD,
-                        size=12,
-                    ),
+                    section_header(Strings.OUTPUT_FOLDER),
                     ft.Row(
                         [
                             self.path_field,
@@ -66,33 +70,48 @@ class OutputPicker:
                 spacing=5,
             ),
             padding=10,
-            border=ft.Border.all(1, ft.Colors.GREY_300),
-            border_radius=8,
+            border=PANEL_BORDER,
+            border_radius=PANEL_BORDER_RADIUS,
         )
 
     def _is_folder_empty(self, path: str) -> bool:
-        """Check if folder is empty (ignoring hidden files)."""
-        folder = Path(path)
-        if not folder.exists():
+        """Check if folder is empty (ignoring hidden files).
+
+        Stops at the first visible entry, and reuses the previous answer
+        while the folder's mtime is unchanged.
+        """
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
             return True
-        visible_files = [f for f in folder.iterdir() if not f.name.startswith(".")]
-        return len(visible_files) == 0
+        cached = self._empty_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with os.scandir(path) as it:
+            is_empty = all(entry.name.startswith(".") for entry in it)
+        self._empty_cache[path] = (mtime, is_empty)
+        return is_empty
 
     async def _on_browse(self, e):
         """Handle browse button click."""
         # Start from previously selected path if available
         initial_dir = self.selected_path if self.selected_path else None
-        result = await self.file_picker.get_directory_path(
-            dialog_title=Strings.SELECT_OUTPUT_TITLE,
-            initial_directory=initial_dir,
-        )
+        # Ignore clicks while another dialog is open
+        if self.picker_lock.locked():
+            return
+        async with self.picker_lock:
+            result = await self.file_picker.get_directory_path(
+                dialog_title=Strings.SELECT_OUTPUT_TITLE,
+                initial_directory=initial_dir,
+            )
         if result:
             self.path_field.value = result
             self.selected_path = result
             self.log(f"Output folder: {result}", "info")
 
             # Warn if not empty
-            if not self._is_folder_empty(result):
+            if not await asyncio.to_thread(self._is_folder_empty, result):
                 self.log(Strings.OUTPUT_NOT_EMPTY_WARNING, "warning")
 
             self.on_selected(result)
@@ -0,0 +1,19 @@
+"""Shared styles for GUI components."""
+
+import flet as ft
+
+# Outline shared by all panels
+PANEL_BORDER = ft.Border.all(1, ft.Colors.GREY_300)
+PANEL_BORDER_RADIUS = 8
+
+
+def section_header(text: str) -> ft.Text:
+    """Create a bold section header label.
+
+    Args:
+        text: Header text
+
+    Returns:
+        ft.Text: Header control
+    """
+    return ft.Text(text, weight=ft.FontWeight.BOLD, size=12)
@@ -28,7 +28,8 @@ class ConverterBridge:
         """
         self.log = log_callback
         self._cancel_requested = False
-        self._debug_log: list[str] = []
+        # Conversion stdout is written straight into this buffer
+        self._debug_sink = io.StringIO()
 
     def get_debug_log(self) -> str:
         """Get the detailed debug log from last conversion.
@@ -36,11 +37,11 @@ class ConverterBridge:
         Returns:
             str: Full stdout output from conversion
         """
-        return "\n".join(self._debug_log)
+        return self._debug_sink.getvalue()
 
     def clear_debug_log(self):
         """Clear the debug log."""
-        self._debug_log.clear()
+        self._debug_sink = io.StringIO()
 
     def check_ffmpeg(self) -> tuple[bool, str]:
         """Check if ffmpeg is available.
@@ -145,9 +146,11 @@ class ConverterBridge:
         Returns:
             ConversionStats from conversion, or None on error.
         """
-        # Capture stdout for debug log
-        stdout_capture = io.StringIO()
-        with redirect_stdout(stdout_capture):
+        # Capture stdout for debug log, one blank line between files
+        sink = self._debug_sink
+        if sink.tell():
+            sink.write("\n")
+        with redirect_stdout(sink):
             stats = convert_to_elmulti(
                 input_path=input_path,
                 output_dir=output_dir,
@@ -159,11 +162,6 @@ class ConverterBridge:
                 thin_max_interval=thin_max_interval,
             )
 
-        # Store captured output
-        captured = stdout_capture.getvalue()
-        if captured:
-            self._debug_log.append(captured)
-
         return stats
 
     def cancel(self):
@@ -78,9 +78,15 @@ class Strings:
     SELECT_OUTPUT_FIRST = "Please select output folder first"
     NO_FILES_FOUND = "No .exs or .sfz files found in {folder}"
     FFMPEG_NOT_FOUND = "ffmpeg is required but not found"
+    INPUT_SKIPPED = "Skipping {filename}: {reason}"
+    INPUT_EMPTY = "file is empty"
+    DUPLICATE_NAME_SKIPPED = (
+        "Skipping {path}: an instrument with the same name was already found"
+    )
 
     # Progress
     STARTING_CONVERSION = "Starting conversion of {count} file(s)..."
     CONVERTING_FILE = "[{current}/{total}] Converting {filename}..."
     CONVERSION_DONE = "Done"
     CONVERSION_RESULT = "Successfully converted {success}/{total} file(s)."
+    NOTHING_TO_CONVERT = "Nothing to convert: all selected files were skipped."
@@ -18,10 +18,13 @@ Copyright (c) 2025, elmconv contributors
 """
 
 import argparse
+import bisect
 import math
-import struct
+import os
+import re
 import sys
 import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # =============================================================================
@@ -31,6 +34,23 @@ from pathlib import Path
 DEFAULT_SAMPLE_RATE = 48000
 DEFAULT_SINGLE_CYCLE_THRESHOLD = 512
 
+# Loop status by diff percentage; each threshold is the exclusive upper
+# bound of the status at the same index (POOR has none)
+_STATUS_THRESHOLDS = (0.1, 1.0, 5.0)
+_STATUSES = (("EXCELLENT", "✓✓"), ("GOOD", "✓"), ("FAIR", "~"), ("POOR", "✗"))
+
+# Full-scale sample value and diff-to-percent factor per sample width (bytes)
+_MAX_SAMPLE_VALUES = {width: 2 ** (width * 8 - 1) - 1 for width in (1, 2, 3)}
+_DIFF_PERCENT_SCALE = {
+    width: 100.0 / max_val for width, max_val in _MAX_SAMPLE_VALUES.items()
+}
+
+# Sample slot fields read from .elmulti files: key = 'string' or key = integer
+_ELMULTI_FIELD_PATTERN = re.compile(
+    r"^[ \t]*(sample|loop-start|loop-end|loop-mode) = (?:'([^'\n]*)'|(-?\d+))",
+    re.MULTILINE,
+)
+
 
 # =============================================================================
 # Utility Functions
@@ -94,35 +114,36 @@ def loop_length_to_pitch(loop_length, sample_rate=DEFAULT_SAMPLE_RATE):
 # =============================================================================
 
 
-def read_wav_samples(filepath):
-    """Read sample data from WAV file.
+def read_wav_samples_at(filepath, indices):
+    """Read individual samples from a WAV file without loading the rest.
+
+    Seeks to each requested frame and decodes only its first channel.
 
     Args:
         filepath: Path to WAV file
+        indices: Frame indices to read
 
     Returns:
-        tuple: (samples list, sample_width in bytes, sample_rate)
+        tuple: (values list, total frames, sample_width in bytes, sample_rate).
+        Out-of-range indices yield None; unsupported files yield ([], 0, 0, 0).
     """
     with wave.open(filepath, "rb") as w:
         sampwidth = w.getsampwidth()
         nframes = w.getnframes()
         sample_rate = w.getframerate()
-        data = w.readframes(nframes)
-
-        if sampwidth == 3:  # 24-bit
-            samples = []
-            for i in range(0, len(data), 3):
-                b = data[i : i + 3]
-                val = int.from_bytes(b, "little", signed=True)
-                samples.append(val)
-            return samples, sampwidth, sample_rate
-        elif sampwidth == 2:  # 16-bit
-            fmt = f"<{nframes}h"
-            return list(struct.unpack(fmt, data)), sampwidth, sample_rate
-        elif sampwidth == 1:  # 8-bit
-            fmt = f"<{nframes}b"
-            return list(struct.unpack(fmt, data)), sampwidth, sample_rate
-    return [], 0, 0
+
+        if sampwidth not in (1, 2, 3):
+            return [], 0, 0, 0
+
+        values = []
+        for index in indices:
+            if not 0 <= index < nframes:
+                values.append(None)
+                continue
+            w.setpos(index)
+            frame = w.readframes(1)[:sampwidth]
+            values.append(int.from_bytes(frame, "little", signed=True))
+        return values, nframes, sampwidth, sample_rate
 
 
 # =============================================================================
@@ -145,22 +166,22 @@ def parse_elmulti(filepath):
     samples = []
     current_sample = {}
 
-    for line in content.split("\n"):
-        line = line.strip()
+    for match in _ELMULTI_FIELD_PATTERN.finditer(content):
+        key, text, number = match.groups()
 
-        if line.startswith("sample = "):
+        if key == "sample":
             if current_sample:
                 samples.append(current_sample)
-            current_sample = {"sample": line.split("'")[1]}
+            current_sample = {"sample": text}
 
-        elif line.startswith("loop-start = "):
-            current_sample["loop_start"] = int(line.split("=")[1].strip())
+        elif key == "loop-start":
+            current_sample["loop_start"] = int(number)
 
-        elif line.startswith("loop-end = "):
-            current_sample["loop_end"] = int(line.split("=")[1].strip())
+        elif key == "loop-end":
+            current_sample["loop_end"] = int(number)
 
-        elif line.startswith("loop-mode = "):
-            current_sample["loop_mode"] = line.split("'")[1]
+        elif key == "loop-mode":
+            current_sample["loop_mode"] = text
 
     if current_sample:
         samples.append(current_sample)
@@ -184,26 +205,28 @@ def analyze_loop_continuity(wav_path, loop_start, loop_end):
     Returns:
         dict: Analysis results
     """
-    samples, sampwidth, sample_rate = read_wav_samples(wav_path)
+    # Only the two loop-point samples are needed, so avoid decoding the file
+    values, total_samples, sampwidth, sample_rate = read_wav_samples_at(
+        wav_path, (loop_start, loop_end)
+    )
 
-    if not samples:
+    if not total_samples:
         return {"error": "Could not read WAV file"}
 
-    total_samples = len(samples)
-
     if loop_end >= total_samples:
         return {"error": f"loop_end ({loop_end}) >= total samples ({total_samples})"}
 
     if loop_start < 0:
         return {"error": f"loop_start ({loop_start}) is negative"}
 
-    val_start = samples[loop_start]
-    val_end = samples[loop_end]
+    if None in values:
+        return {"error": f"loop_start ({loop_start}) is out of range"}
+    val_start, val_end = values
     diff = abs(val_end - val_start)
 
     # Normalize to percentage of max value
-    max_val = (2 ** (sampwidth * 8 - 1)) - 1
-    diff_percent = (diff / max_val) * 100
+    max_val = _MAX_SAMPLE_VALUES[sampwidth]
+    diff_percent = diff * _DIFF_PERCENT_SCALE[sampwidth]
 
     # Calculate loop length (inclusive: loop_end is played as part of the loop)
     loop_length = loop_end - loop_start + 1
@@ -240,12 +263,20 @@ def analyze_instrument(elmulti_dir, verbose=False, single_cycle_threshold=512):
     """
     elmulti_dir = Path(elmulti_dir)
 
-    # Find elmulti file
-    elmulti_files = list(elmulti_dir.glob("*.elmulti"))
+    # List the directory once: find the elmulti file and note all file names
+    # so sample lookups below don't need a stat call each
+    try:
+        with os.scandir(elmulti_dir) as it:
+            entries = [entry for entry in it if entry.is_file()]
+    except OSError:
+        # Missing path or not a directory
+        return {"error": "No .elmulti file found"}
+    file_names = {entry.name for entry in entries}
+    elmulti_files = [entry for entry in entries if entry.name.endswith(".elmulti")]
     if not elmulti_files:
         return {"error": "No .elmulti file found"}
 
-    elmulti_path = elmulti_files[0]
+    elmulti_path = Path(elmulti_files[0].path)
     instrument_name = elmulti_path.stem
 
     # Parse elmulti
@@ -263,6 +294,10 @@ def analyze_instrument(elmulti_dir, verbose=False, single_cycle_threshold=512):
         "pitch_info": None,
     }
 
+    # Looped samples to analyze: (wav_path, loop_start, loop_end) per result
+    pending_results = []
+    pending_jobs = []
+
     for slot in sample_slots:
         sample_name = slot.get("sample")
         loop_mode = slot.get("loop_mode", "Off")
@@ -285,17 +320,9 @@ def analyze_instrument(elmulti_dir, verbose=False, single_cycle_threshold=512):
                 results["loop_length"] = loop_length
                 results["is_single_cycle"] = loop_length <= single_cycle_threshold
 
-            if wav_path.exists():
-                analysis = analyze_loop_continuity(str(wav_path), loop_start, loop_end)
-                sample_result.update(analysis)
-
-                if "diff_percent" in analysis:
-                    if analysis["diff_percent"] > results["max_diff_percent"]:
-                        results["max_diff_percent"] = analysis["diff_percent"]
-                        results["worst_sample"] = sample_name
-
-                if "pitch_info" in analysis and results["pitch_info"] is None:
-                    results["pitch_info"] = analysis["pitch_info"]
+            if sample_name in file_names or wav_path.exists():
+                pending_results.append(sample_result)
+                pending_jobs.append((str(wav_path), loop_start, loop_end))
             else:
                 sample_result["error"] = f"WAV file not found: {wav_path}"
         else:
@@ -303,6 +330,31 @@ def analyze_instrument(elmulti_dir, verbose=False, single_cycle_threshold=512):
 
         results["samples"].append(sample_result)
 
+    # Read WAV files concurrently (I/O bound), then merge in slot order.
+    # Slots sharing a WAV and loop points are analyzed only once.
+    if pending_jobs:
+        unique_jobs = list(dict.fromkeys(pending_jobs))
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            analyses = dict(
+                zip(
+                    unique_jobs,
+                    executor.map(analyze_loop_continuity, *zip(*unique_jobs)),
+                )
+            )
+
+        for sample_result, job in zip(pending_results, pending_jobs):
+            analysis = analyses[job]
+            sample_result.update(analysis)
+
+            if "diff_percent" in analysis:
+                if analysis["diff_percent"] > results["max_diff_percent"]:
+                    results["max_diff_percent"] = analysis["diff_percent"]
+                    results["worst_sample"] = sample_result["name"]
+
+            if "pitch_info" in analysis and results["pitch_info"] is None:
+                results["pitch_info"] = analysis["pitch_info"]
+
     return results
 
 
@@ -313,14 +365,19 @@ def analyze_instrument(elmulti_dir, verbose=False, single_cycle_threshold=512):
 
 def get_status(diff_percent):
     """Get status string and symbol from diff percentage."""
-    if diff_percent < 0.1:
-        return "EXCELLENT", "✓✓"
-    elif diff_percent < 1.0:
-        return "GOOD", "✓"
-    elif diff_percent < 5.0:
-        return "FAIR", "~"
-    else:
-        return "POOR", "✗"
+    return _STATUSES[bisect.bisect_right(_STATUS_THRESHOLDS, diff_percent)]
+
+
+def count_statuses(results):
+    """Count instruments per status in a single pass.
+
+    Returns:
+        dict: Count for each of EXCELLENT, GOOD, FAIR and POOR
+    """
+    counts = dict.fromkeys((status for status, _ in _STATUSES), 0)
+    for r in results:
+        counts[get_status(r["max_diff_percent"])[0]] += 1
+    return counts
 
 
 def print_analysis(
@@ -401,13 +458,14 @@ def print_detailed_summary(all_results, single_cycle_threshold=512):
     )
     print("-" * 70)
     if normal_loop:
-        excellent = sum(1 for r in normal_loop if r["max_diff_percent"] < 0.1)
-        good = sum(1 for r in normal_loop if 0.1 <= r["max_diff_percent"] < 1.0)
-        fair = sum(1 for r in normal_loop if 1.0 <= r["max_diff_percent"] < 5.0)
-        poor = sum(1 for r in normal_loop if r["max_diff_percent"] >= 5.0)
-        print(f"  EXCELLENT: {excellent}  GOOD: {good}  FAIR: {fair}  POOR: {poor}")
+        counts = count_statuses(normal_loop)
+        print(
+            f"  EXCELLENT: {counts['EXCELLENT']}  GOOD: {counts['GOOD']}  "
+            f"FAIR: {counts['FAIR']}  POOR: {counts['POOR']}"
+        )
 
-        for r in sorted(normal_loop, key=lambda x: x["max_diff_percent"]):
+        normal_loop.sort(key=lambda x: x["max_diff_percent"])
+        for r in normal_loop:
             status, sym = get_status(r["max_diff_percent"])
             pitch = r.get("pitch_info")
             pitch_str = ""
@@ -427,14 +485,15 @@ def print_detailed_summary(all_results, single_cycle_threshold=512):
     )
     print("-" * 70)
     if single_cycle:
-        excellent = sum(1 for r in single_cycle if r["max_diff_percent"] < 0.1)
-        good = sum(1 for r in single_cycle if 0.1 <= r["max_diff_percent"] < 1.0)
-        fair = sum(1 for r in single_cycle if 1.0 <= r["max_diff_percent"] < 5.0)
-        poor = sum(1 for r in single_cycle if r["max_diff_percent"] >= 5.0)
-        print(f"  EXCELLENT: {excellent}  GOOD: {good}  FAIR: {fair}  POOR: {poor}")
+        counts = count_statuses(single_cycle)
+        print(
+            f"  EXCELLENT: {counts['EXCELLENT']}  GOOD: {counts['GOOD']}  "
+            f"FAIR: {counts['FAIR']}  POOR: {counts['POOR']}"
+        )
         print("  ※ シングルサイクルはピッチ優先のため、diff%が高くても正常")
 
-        for r in sorted(single_cycle, key=lambda x: x["loop_length"]):
+        single_cycle.sort(key=lambda x: x["loop_length"])
+        for r in single_cycle:
             status, sym = get_status(r["max_diff_percent"])
             pitch = r.get("pitch_info")
             pitch_str = ""
@@ -452,7 +511,8 @@ def print_detailed_summary(all_results, single_cycle_threshold=512):
     print(f"\n【ループなし】{len(no_loop)} 件")
     print("-" * 70)
     if no_loop:
-        for r in sorted(no_loop, key=lambda x: x["instrument"]):
+        no_loop.sort(key=lambda x: x["instrument"])
+        for r in no_loop:
             print(f"    {r['instrument']}")
     else:
         print("  (なし)")
@@ -535,7 +595,9 @@ Status indicators:
 
     if args.all:
         # Analyze all subdirectories
-        subdirs = sorted([d for d in directory.iterdir() if d.is_dir()])
+        # DirEntry.is_dir() uses the type from the directory listing (no stat)
+        with os.scandir(directory) as it:
+            subdirs = sorted(Path(entry.path) for entry in it if entry.is_dir())
 
         if not subdirs:
             print(f"No subdirectories found in {directory}")
@@ -557,10 +619,7 @@ Status indicators:
             all_results.sort(key=lambda r: r.get("loop_length") or 0, reverse=True)
 
         # Print results
-        excellent_count = 0
-        good_count = 0
-        fair_count = 0
-        poor_count = 0
+        status_counts = dict.fromkeys((status for status, _ in _STATUSES), 0)
         no_loop_count = 0
 
         for results in all_results:
@@ -573,22 +632,16 @@ Status indicators:
 
             if not results["has_loops"]:
                 no_loop_count += 1
-            elif results["max_diff_percent"] < 0.1:
-                excellent_count += 1
-            elif results["max_diff_percent"] < 1.0:
-                good_count += 1
-            elif results["max_diff_percent"] < 5.0:
-                fair_count += 1
             else:
-                poor_count += 1
+                status_counts[get_status(results["max_diff_percent"])[0]] += 1
 
         # Print summary
         print(f"\n{'=' * 50}")
         print("Summary:")
-        print(f"  EXCELLENT (< 0.1%): {excellent_count}")
-        print(f"  GOOD (< 1.0%):      {good_count}")
-        print(f"  FAIR (< 5.0%):      {fair_count}")
-        print(f"  POOR (>= 5.0%):     {poor_count}")
+        print(f"  EXCELLENT (< 0.1%): {status_counts['EXCELLENT']}")
+        print(f"  GOOD (< 1.0%):      {status_counts['GOOD']}")
+        print(f"  FAIR (< 5.0%):      {status_counts['FAIR']}")
+        print(f"  POOR (>= 5.0%):     {status_counts['POOR']}")
         print(f"  No loops:           {no_loop_count}")
 
         # Print detailed summary if requested
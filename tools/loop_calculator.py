@@ -21,17 +21,29 @@ import argparse
 import math
 import sys
 
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+
+# Frequencies and names (MIDI 60 = C3) for notes 0-127; other keys are computed
+_MIDI_FREQS = tuple(440.0 * (2 ** ((n - 69) / 12)) for n in range(128))
+_MIDI_NAMES = tuple(f"{NOTE_NAMES[n % 12]}{(n // 12) - 2}" for n in range(128))
+
+# Converts a natural-log frequency ratio to cents (1200 / ln 2)
+_LN_TO_CENTS = 1200 / math.log(2)
+
 
 def midi_to_freq(midi_note: int) -> float:
     """Convert MIDI note number to frequency in Hz."""
+    if 0 <= midi_note < 128:
+        return _MIDI_FREQS[midi_note]
     return 440.0 * (2 ** ((midi_note - 69) / 12))
 
 
 def midi_to_name(midi_note: int) -> str:
     """Convert MIDI note number to note name (e.g., 60 -> C3)."""
-    note_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+    if 0 <= midi_note < 128:
+        return _MIDI_NAMES[midi_note]
     octave = (midi_note // 12) - 2  # MIDI 60 = C3
-    note = note_names[midi_note % 12]
+    note = NOTE_NAMES[midi_note % 12]
     return f"{note}{octave}"
 
 
@@ -49,10 +61,8 @@ def cents_per_sample(samples_in_cycle: float) -> float:
     """Calculate pitch error in cents for 1 sample deviation."""
     if samples_in_cycle <= 0:
         return 0
-    # 1 sample error ratio
-    ratio = (samples_in_cycle + 1) / samples_in_cycle
-    # Convert ratio to cents: 1200 * log2(ratio)
-    return 1200 * math.log2(ratio)
+    # 1 sample error ratio is 1 + 1/n; log1p stays accurate for long cycles
+    return _LN_TO_CENTS * math.log1p(1 / samples_in_cycle)
 
 
 def find_ideal_loop_lengths(samples_per_cyc: float, max_cycles: int = 16) -> list:
@@ -77,14 +87,11 @@ def find_ideal_loop_lengths(samples_per_cyc: float, max_cycles: int = 16) -> lis
 
     # Sort by absolute error
     results.sort(key=lambda x: abs(x[3]))
-    # Remove duplicates (same length)
-    seen_lengths = set()
-    unique_results = []
+    # Remove duplicates (same length), keeping the best-scoring entry
+    unique_results = {}
     for r in results:
-        if r[1] not in seen_lengths:
-            seen_lengths.add(r[1])
-            unique_results.append(r)
-    return unique_results[:8]
+        unique_results.setdefault(r[1], r)
+    return list(unique_results.values())[:8]
 
 
 def print_separator(char: str = "=", length: int = 60):
@@ -103,6 +110,7 @@ def print_results(
 
     original_sr = calculate_original_sr(wav_sr, transpose)
     freq = midi_to_freq(midi_key)
+    ms_per_cycle = 1000 / freq
     note_name = midi_to_name(midi_key)
     resample_ratio = target_sr / original_sr
 
@@ -110,6 +118,10 @@ def print_results(
     orig_spc = samples_per_cycle(original_sr, freq)
     target_spc = samples_per_cycle(target_sr, freq)
 
+    # Ideal loop lengths (shared by the length and loop end tables)
+    orig_ideal = find_ideal_loop_lengths(orig_spc)
+    target_ideal = find_ideal_loop_lengths(target_spc)
+
     # Print header
     print()
     print_separator("=")
@@ -136,8 +148,8 @@ def print_results(
     print()
     print(f"[ Pitch Information ({note_name} / MIDI {midi_key} / {freq:.2f} Hz) ]")
     print_separator("-")
-    print(f"  Original SR:  1 cycle = {orig_spc:.2f} samples ({1000 / freq:.3f} ms)")
-    print(f"  Target SR:    1 cycle = {target_spc:.2f} samples ({1000 / freq:.3f} ms)")
+    print(f"  Original SR:  1 cycle = {orig_spc:.2f} samples ({ms_per_cycle:.3f} ms)")
+    print(f"  Target SR:    1 cycle = {target_spc:.2f} samples ({ms_per_cycle:.3f} ms)")
 
     # Error sensitivity
     print()
@@ -167,8 +179,10 @@ def print_results(
         print(
             f"  Converted:  start={new_start:.2f}, end={new_end:.2f}, length={new_length:.2f}"
         )
+        rounded_start = round(new_start)
+        rounded_end = round(new_end)
         print(
-            f"  Rounded:    start={round(new_start)}, end={round(new_end)}, length={round(new_end) - round(new_start) + 1}"
+            f"  Rounded:    start={rounded_start}, end={rounded_end}, length={rounded_end - rounded_start + 1}"
         )
 
         cycles_in_loop = loop_length / orig_spc
@@ -190,7 +204,7 @@ def print_results(
     print(f"\n  Original SR ({original_sr:,.0f} Hz): 1 cycle = {orig_spc:.2f} samples")
     print(f"  {'cycles':<8} {'length':<10} {'error':<12} {'cents':<10}")
     print(f"  {'-' * 8} {'-' * 10} {'-' * 12} {'-' * 10}")
-    for cycles, length, err_pct, err_cents in find_ideal_loop_lengths(orig_spc):
+    for cycles, length, err_pct, err_cents in orig_ideal:
         mark = " <-- best" if abs(err_cents) < 1 else ""
         print(
             f"  x{cycles:<7} {length:<10} {err_pct:+.3f}%      {err_cents:+.1f}{mark}"
@@ -200,7 +214,7 @@ def print_results(
     print(f"\n  Target SR ({target_sr:,} Hz): 1 cycle = {target_spc:.2f} samples")
     print(f"  {'cycles':<8} {'length':<10} {'error':<12} {'cents':<10}")
     print(f"  {'-' * 8} {'-' * 10} {'-' * 12} {'-' * 10}")
-    for cycles, length, err_pct, err_cents in find_ideal_loop_lengths(target_spc):
+    for cycles, length, err_pct, err_cents in target_ideal:
         mark = " <-- best" if abs(err_cents) < 1 else ""
         print(
             f"  x{cycles:<7} {length:<10} {err_pct:+.3f}%      {err_cents:+.1f}{mark}"
@@ -215,7 +229,7 @@ def print_results(
         print(f"\n  Original SR ({original_sr:,.0f} Hz):")
         print(f"  {'cycles':<8} {'loop_end':<10} {'length':<10} {'cents':<10}")
         print(f"  {'-' * 8} {'-' * 10} {'-' * 10} {'-' * 10}")
-        for cycles, length, err_pct, err_cents in find_ideal_loop_lengths(orig_spc)[:6]:
+        for cycles, length, err_pct, err_cents in orig_ideal[:6]:
             loop_end_calc = loop_start + length - 1  # Inclusive end
             mark = " <-- best" if abs(err_cents) < 1 else ""
             print(
@@ -227,9 +241,7 @@ def print_results(
         print(f"\n  Target SR ({target_sr:,} Hz, start={converted_start}):")
         print(f"  {'cycles':<8} {'loop_end':<10} {'length':<10} {'cents':<10}")
         print(f"  {'-' * 8} {'-' * 10} {'-' * 10} {'-' * 10}")
-        for cycles, length, err_pct, err_cents in find_ideal_loop_lengths(target_spc)[
-            :6
-        ]:
+        for cycles, length, err_pct, err_cents in target_ideal[:6]:
             loop_end_calc = converted_start + length - 1  # Inclusive end
             mark = " <-- best" if abs(err_cents) < 1 else ""
             print(